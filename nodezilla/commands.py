@@ -130,10 +130,7 @@ class RotateComponentCommand(QUndoCommand):
 
 
     def _refresh(self):
-        for port in ([p for p in getattr(self.comp, 'ports', []) if p is not None] or [p for p in (getattr(self.comp, 'port_left', None), getattr(self.comp, 'port_right', None)) if p is not None]):
-            for w in list(port.wires):
-                w.update_path()
-        self.comp._update_label()
+        self.comp._refresh_attached()
 
 
     def redo(self):
@@ -145,28 +142,20 @@ class RotateComponentCommand(QUndoCommand):
 
 
 class MirrorComponentCommand(QUndoCommand):
-    """Undoable component mirror (X/Y) with wire/label refresh."""
+    """Undoable component mirror (X/Y); the transform change refreshes wires/labels."""
     def __init__(self, comp: ComponentItem, old_mirror: tuple[float, float], new_mirror: tuple[float, float]):
         super().__init__(f"Mirror {comp.refdes or comp.kind}")
         self.comp = comp
         self.old = (float(old_mirror[0]), float(old_mirror[1]))
         self.new = (float(new_mirror[0]), float(new_mirror[1]))
 
-    def _refresh(self):
-        for port in ([p for p in getattr(self.comp, 'ports', []) if p is not None] or [p for p in (getattr(self.comp, 'port_left', None), getattr(self.comp, 'port_right', None)) if p is not None]):
-            for w in list(port.wires):
-                w.update_path()
-        self.comp._update_label()
-
     def redo(self):
         if hasattr(self.comp, "set_mirror"):
             self.comp.set_mirror(self.new[0], self.new[1])
-            self._refresh()
 
     def undo(self):
         if hasattr(self.comp, "set_mirror"):
             self.comp.set_mirror(self.old[0], self.old[1])
-            self._refresh()
 
 
 class DeleteItemsCommand(QUndoCommand):
@@ -241,7 +230,7 @@ class SetWirePointsCommand(QUndoCommand):
         super().__init__("Edit Wire")
         self.wire = wire
         self.new = list(new_pts) if new_pts else []
-        self.old = list(getattr(wire, "_pts", []))
+        self.old = wire.waypoints() if hasattr(wire, "waypoints") else []
 
     def redo(self):
         self.wire.set_points(self.new)
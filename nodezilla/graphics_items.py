@@ -2,13 +2,15 @@
 # File: nodezilla/graphics_items.py
 # ========================================
 from __future__ import annotations
+from array import array
 from pathlib import Path
+import copy
 import json
 from typing import Optional, List
 from PySide6.QtCore import Qt, QPointF, QRectF
-from PySide6.QtGui import QColor, QBrush, QPen, QPainterPath, QTransform, QFont
+from PySide6.QtGui import QColor, QBrush, QPalette, QPen, QPainterPath, QPolygonF, QTransform, QFont
 from PySide6.QtWidgets import (
-QGraphicsItem, QGraphicsRectItem, QGraphicsEllipseItem, QGraphicsTextItem,
+QApplication, QStyle, QGraphicsItem, QGraphicsRectItem, QGraphicsEllipseItem, QGraphicsTextItem,
 QGraphicsPathItem
 )
 from typing import TYPE_CHECKING
@@ -23,6 +25,23 @@ COMP_WIDTH = 100.0
 COMP_HEIGHT = 40.0
 DEBUG_COMPONENT_OVERLAY = False
 
+# Fixed port/handle fills and outlines, shared by every instance (QBrush/QPen
+# are implicitly shared). Themed pens come from _shared_pen() instead.
+_BRUSH_WHITE = QBrush(Qt.white)
+_BRUSH_YELLOW = QBrush(Qt.yellow)
+_BRUSH_LIGHT_GRAY = QBrush(Qt.lightGray)
+_PEN_HANDLE = QPen(Qt.darkGray, 1)
+_PEN_NONE = QPen(Qt.NoPen)
+
+# Every port is the same fixed circle, outlined with a 1.25 px pen.
+_PORT_RECT = QRectF(-PORT_RADIUS, -PORT_RADIUS, 2 * PORT_RADIUS, 2 * PORT_RADIUS)
+_PORT_BOUNDS = _PORT_RECT.adjusted(-0.625, -0.625, 0.625, 0.625)  # + half the pen width
+_PORT_SHAPE = QPainterPath()
+_PORT_SHAPE.addEllipse(_PORT_BOUNDS)
+# Outline box drawn for kinds without a usable symbol; shared like symbol paths.
+_FALLBACK_SYMBOL_PATH = QPainterPath()
+_FALLBACK_SYMBOL_PATH.addRect(-COMP_WIDTH / 2, -COMP_HEIGHT / 2, COMP_WIDTH, COMP_HEIGHT)
+
 
 def _auto_contrast_color(bg: QColor) -> QColor:
     r, g, b = bg.red(), bg.green(), bg.blue()
@@ -30,6 +49,169 @@ def _auto_contrast_color(bg: QColor) -> QColor:
     return QColor(20, 20, 20) if luma > 128 else QColor(235, 235, 235)
 
 
+def _add_line_shape(p: QPainterPath, shape: dict):
+    x1, y1, x2, y2 = shape["x1"], shape["y1"], shape["x2"], shape["y2"]
+    n = p.elementCount()
+    if n >= 2:
+        # A line that carries straight on from a previous line (its subpath is
+        # just moveTo + lineTo, so never a rect edge) moves that line's end
+        # instead: same stroke, no extra subpath.
+        a, b = p.elementAt(n - 2), p.elementAt(n - 1)
+        if a.isMoveTo() and b.isLineTo() and b.x == x1 and b.y == y1:
+            dx0, dy0 = b.x - a.x, b.y - a.y
+            dx1, dy1 = x2 - x1, y2 - y1
+            if dx0 * dy1 == dy0 * dx1 and dx0 * dx1 + dy0 * dy1 > 0:
+                p.setElementPositionAt(n - 1, x2, y2)
+                return
+    p.moveTo(x1, y1)
+    p.lineTo(x2, y2)
+
+
+def _add_rect_shape(p: QPainterPath, shape: dict):
+    p.addRect(shape["x"], shape["y"], shape["w"], shape["h"])
+
+
+def _add_ellipse_shape(p: QPainterPath, shape: dict):
+    p.addEllipse(shape["x"], shape["y"], shape["w"], shape["h"])
+
+
+def _add_polyline_shape(p: QPainterPath, shape: dict):
+    pts = shape.get("points", [])
+    if pts:
+        # Same open moveTo/lineTo subpath, appended in a single call.
+        p.addPolygon(QPolygonF([QPointF(x, y) for x, y in pts]))
+
+
+# Symbol JSON shape type -> path builder. "text" shapes become child items instead.
+_SHAPE_BUILDERS = {
+    "line": _add_line_shape,
+    "rect": _add_rect_shape,
+    "ellipse": _add_ellipse_shape,
+    "polyline": _add_polyline_shape,
+}
+
+
+# Compiled symbols (outline path + text shapes) keyed by file path, and resolved
+# symbol files / compiled symbols keyed by component kind, shared by every
+# ComponentItem. QPainterPath is implicitly shared, so all components of a kind
+# draw the same path data. All are dropped whenever the component library is
+# reloaded, which is how edited/saved symbols are picked up.
+_SYMBOL_CACHE: dict[str, tuple[QPainterPath, list]] = {}
+_SYMBOL_PATH_CACHE: dict[str, Optional[Path]] = {}
+_KIND_SYMBOL_CACHE: dict[str, Optional[tuple[QPainterPath, list]]] = {}
+# Parsed chip templates keyed by their path relative to the chips folder. Saving
+# a reusable chip reloads the library, so these follow the same invalidation.
+_CHIP_TEMPLATE_CACHE: dict[str, dict] = {}
+_symbol_cache_library = None
+
+
+def _symbol_library():
+    global _symbol_cache_library
+    lib = load_component_library()
+    if lib is not _symbol_cache_library:
+        _SYMBOL_CACHE.clear()
+        _SYMBOL_PATH_CACHE.clear()
+        _KIND_SYMBOL_CACHE.clear()
+        _CHIP_TEMPLATE_CACHE.clear()
+        _symbol_cache_library = lib
+    return lib
+
+
+def _symbol_path_for(kind: str) -> Optional[Path]:
+    lib = _symbol_library()
+    if kind in _SYMBOL_PATH_CACHE:
+        return _SYMBOL_PATH_CACHE[kind]
+    path = None
+    comp_def = lib.get(kind)
+    if comp_def and comp_def.symbol:
+        symbol = str(comp_def.symbol).replace("\\", "/")
+        candidate = user_assets_root() / "symbols" / symbol
+        if candidate.exists():
+            path = candidate
+    _SYMBOL_PATH_CACHE[kind] = path
+    return path
+
+
+def _load_symbol(path: Path) -> tuple[QPainterPath, list]:
+    """Return the compiled outline path and the text shapes of a symbol file.
+
+    Text shapes come back parsed as (text, font_size, x, y).
+    """
+    _symbol_library()
+    key = str(path)
+    entry = _SYMBOL_CACHE.get(key)
+    if entry is None:
+        data = json.loads(path.read_text())
+        p = QPainterPath()
+        texts = []
+        for shape in data.get("shapes", []):
+            t = shape.get("type")
+            build = _SHAPE_BUILDERS.get(t)
+            if build is not None:
+                build(p, shape)
+            elif t == "text":
+                texts.append((
+                    str(shape.get("text", "")),
+                    int(shape.get("font_size", 12)),
+                    float(shape.get("x", 0.0)),
+                    float(shape.get("y", 0.0)),
+                ))
+        entry = (p, texts)
+        _SYMBOL_CACHE[key] = entry
+    return entry
+
+
+def _symbol_for_kind(kind: str) -> Optional[tuple[QPainterPath, list]]:
+    """Compiled symbol for a component kind, or None if it has no usable symbol.
+
+    Missing and unreadable symbol files are remembered too, so a broken kind
+    isn't re-read for every instance.
+    """
+    _symbol_library()
+    try:
+        return _KIND_SYMBOL_CACHE[kind]
+    except KeyError:
+        pass
+    entry = None
+    path = _symbol_path_for(kind)
+    if path is not None:
+        try:
+            entry = _load_symbol(path)
+        except Exception:
+            entry = None
+    _KIND_SYMBOL_CACHE[kind] = entry
+    return entry
+
+
+# Application palette colors by role, dropped when the palette changes.
+_PALETTE_COLORS: dict[QPalette.ColorRole, QColor] = {}
+_palette_watch_app = None
+
+
+def _palette_color(role: QPalette.ColorRole) -> QColor:
+    global _palette_watch_app
+    color = _PALETTE_COLORS.get(role)
+    if color is None:
+        app = QApplication.instance()
+        color = app.palette().color(role)
+        if _palette_watch_app is not app:
+            try:
+                app.paletteChanged.connect(_reset_palette_colors)
+            except Exception:
+                return color  # no change notification: don't cache
+            _palette_watch_app = app
+        _PALETTE_COLORS[role] = color
+    return color
+
+
+def _palette_text_color() -> QColor:
+    return _palette_color(QPalette.Text)
+
+
+def _reset_palette_colors(*_args):
+    _PALETTE_COLORS.clear()
+
+
 class InlineLabel(QGraphicsTextItem):
     """Draggable label bound to a ComponentItem (refdes or value)."""
     def __init__(self, parent_item: 'ComponentItem', kind: str):
@@ -38,16 +220,36 @@ class InlineLabel(QGraphicsTextItem):
         self.kind = kind  # "refdes" | "value"
         self._manual_pos = False
         self._setting_default = False
+        self._text = ""
+        self._text_size: tuple[float, float] | None = None  # layout size of _text
         self.setDefaultTextColor(self._text_color())
         self.setZValue(4)
         self.setTextInteractionFlags(Qt.NoTextInteraction)
         self.setFlag(QGraphicsItem.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
+        # Static text: blit a cached raster instead of re-laying out glyphs each frame.
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
     def _text_color(self):
-        from PySide6.QtWidgets import QApplication
-        return QApplication.instance().palette().text().color()
+        # Same resolution as the component's other labels (theme, then palette),
+        # so a label created after theming starts out in the theme color.
+        return self._parent._label_text_color()
+
+    def set_text(self, text: str):
+        """setPlainText, skipped when the text is unchanged (it rebuilds the document)."""
+        if text != self._text:
+            self._text = text
+            self._text_size = None
+            self.setPlainText(text)
+
+    def text_size(self) -> tuple[float, float]:
+        """Width/height of the laid-out text, memoized until the text changes."""
+        size = self._text_size
+        if size is None:
+            br = self.boundingRect()
+            size = self._text_size = (br.width(), br.height())
+        return size
 
     def set_default_pos(self, p: QPointF):
         self._setting_default = True
@@ -71,23 +273,30 @@ class InlineLabel(QGraphicsTextItem):
 class PortItem(QGraphicsEllipseItem):
     """Terminal pin on a ComponentItem; drives wire updates."""
     def __init__(self, parent: 'ComponentItem', name: str, rel_pos: QPointF, pin_number: int | None = None):
-        super().__init__(-PORT_RADIUS, -PORT_RADIUS, 2*PORT_RADIUS, 2*PORT_RADIUS, parent)
-        self.setBrush(QBrush(Qt.white))
-        self.setPen(QPen(Qt.black, 1.25))
+        super().__init__(_PORT_RECT, parent)
+        self.setBrush(_BRUSH_WHITE)
+        self.setPen(_shared_pen(QColor(Qt.black), 1.25, False))
         self.setZValue(2)
         self.name = name
         self.pin_number = pin_number
         self.rel_pos = rel_pos
         self.setPos(rel_pos)
         self.wires: List['WireItem'] = []
+        # Scene position as floats for wire geometry keys (see scene_xy).
+        # Cleared on this pin's own moves and by the owning ComponentItem
+        # when it moves, rotates or mirrors.
+        self._scene_xy: tuple[float, float] | None = None
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
         self.setAcceptHoverEvents(True)
+        # Pins only change look on hover/theme; setBrush/setPen invalidate the cache.
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
     def apply_theme(self, theme: Theme):
-        from PySide6.QtGui import QBrush, QPen
         # Keep port fill visible against bg; white works in both themes
-        self.setBrush(QBrush(Qt.white))
-        self.setPen(QPen(theme.component_stroke, 1.25))
+        self.setBrush(_BRUSH_WHITE)
+        pen = _shared_pen(theme.component_stroke, 1.25, False)
+        if self.pen() != pen:
+            self.setPen(pen)
 
     def ensure_visible(self):
         try:
@@ -97,42 +306,76 @@ class PortItem(QGraphicsEllipseItem):
             bg = None
         if bg is None or not isinstance(bg, QColor):
             bg = QColor(245, 246, 248)
-        pen = QPen(_auto_contrast_color(bg), 1.25)
-        self.setPen(pen)
+        self.setPen(_shared_pen(_auto_contrast_color(bg), 1.25, False))
+
+    def boundingRect(self) -> QRectF:
+        # Rect and pen width never change, so skip the ellipse item's recompute.
+        return _PORT_BOUNDS
+
+    def shape(self) -> QPainterPath:
+        return _PORT_SHAPE
 
     def add_wire(self, wire: 'WireItem'):
         if wire not in self.wires:
             self.wires.append(wire)
+            parent = self.parentItem()
+            if isinstance(parent, ComponentItem):
+                parent._all_wires.add(wire)
 
 
     def remove_wire(self, wire: 'WireItem'):
         if wire in self.wires:
             self.wires.remove(wire)
+            parent = self.parentItem()
+            if isinstance(parent, ComponentItem) and not any(wire in p.wires for p in parent.ports):
+                parent._all_wires.discard(wire)
+
 
+    def scene_xy(self) -> tuple[float, float]:
+        xy = self._scene_xy
+        if xy is None:
+            p = self.scenePos()
+            xy = self._scene_xy = (p.x(), p.y())
+        return xy
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemPositionHasChanged:
-            for w in self.wires:
-                w.update_path()
+            self._scene_xy = None
+            parent = self.parentItem()
+            if isinstance(parent, ComponentItem):
+                parent._routing_rect = None
+            sc = self.scene()
+            if sc is not None:
+                for w in self.wires:
+                    sc._mark_wire_dirty(w)
+            else:
+                for w in self.wires:
+                    w.update_path()
         return super().itemChange(change, value)
 
 
     def hoverEnterEvent(self, e):
-        self.setBrush(QBrush(Qt.yellow)); super().hoverEnterEvent(e)
+        self.setBrush(_BRUSH_YELLOW); super().hoverEnterEvent(e)
 
 
     def hoverLeaveEvent(self, e):
-        self.setBrush(QBrush(Qt.white)); super().hoverLeaveEvent(e)
+        self.setBrush(_BRUSH_WHITE); super().hoverLeaveEvent(e)
 
 
-class JsonSymbolItem(QGraphicsPathItem):
-    def __init__(self, path: QPainterPath):
-        super().__init__(path)
-        pen = QPen(QColor(20, 20, 20), 2)
-        pen.setCosmetic(True)
-        self.setPen(pen)
-        self.setBrush(Qt.NoBrush)
-        self.setZValue(2)
+# Themed pens shared across items (symbols, wires, ports), keyed by
+# (RGBA, width, cosmetic). QPen is implicitly shared, so handing the same
+# instance to many items costs nothing and makes equality checks cheap.
+_PEN_CACHE: dict[tuple[int, float, bool], QPen] = {}
+
+
+def _shared_pen(color: QColor, width: float = 2.0, cosmetic: bool = True) -> QPen:
+    key = (color.rgba(), width, cosmetic)
+    pen = _PEN_CACHE.get(key)
+    if pen is None:
+        pen = QPen(color, width)
+        pen.setCosmetic(cosmetic)
+        _PEN_CACHE[key] = pen
+    return pen
 
 
 class CommentTextItem(QGraphicsTextItem):
@@ -212,11 +455,29 @@ class ComponentItem(QGraphicsRectItem):
         super().__init__(-COMP_WIDTH/2, -COMP_HEIGHT/2, COMP_WIDTH, COMP_HEIGHT)
         init_pos = QPointF(pos)
         self.kind = kind
-        self.setBrush(QBrush(Qt.NoBrush))
-        self.setPen(QPen(Qt.NoPen))
+        # The body rect draws nothing itself (the brush is NoBrush by default).
+        # ItemHasNoContents can't be used: paint() strokes the symbol.
+        self.setPen(_PEN_NONE)
         self._theme: Theme | None = None
+        # Label text color resolved at apply_theme time (None until themed).
+        self._label_color: QColor | None = None
+        # Inputs of the last _update_label layout; unchanged inputs skip the relayout.
+        self._label_key: tuple | None = None
+        # Same for the chip pin-number labels (_update_pin_labels).
+        self._pin_label_key: tuple | None = None
+        # Upright-text transform for the labels and the (rotation, mx, my) it is for.
+        self._label_tf_key: tuple | None = None
+        self._label_tf = QTransform()
+        # routing_local_rect() result; cleared when the symbol or a port moves.
+        self._routing_rect: QRectF | None = None
+        # forbidden_local_rect() and shape() results; cleared with the symbol.
+        self._forbidden_rect: QRectF | None = None
+        self._shape_path: QPainterPath | None = None
         self._mirror_x = 1.0
         self._mirror_y = 1.0
+        # Snap settings pushed by the scene (set_snap); off until added to one.
+        self._snap_on = False
+        self._snap_grid = 20.0
         self.setFlags(
             QGraphicsItem.ItemIsMovable |
             QGraphicsItem.ItemIsSelectable |
@@ -224,24 +485,38 @@ class ComponentItem(QGraphicsRectItem):
         )
         self.setZValue(1)
         self.setRotation(0)
+        # The symbol outline is static vector art; pans and unrelated repaints
+        # blit it. update() (theme/selection/symbol swaps) re-renders it.
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
         # metadata
         self.refdes: str = ""
         self.value: str = ""
 
-        # separate draggable labels
-        self.refdes_label = InlineLabel(self, "refdes")
-        self.value_label = InlineLabel(self, "value")
+        # separate draggable labels, created on first non-empty text (_ensure_label)
+        self.refdes_label: InlineLabel | None = None
+        self.value_label: InlineLabel | None = None
         self.pin_labels: List[QGraphicsTextItem] = []
 
         # symbol
-        self.symbol_item: QGraphicsPathItem | None = None
+        # The symbol outline is painted by the component itself (see paint());
+        # _symbol_path is the per-kind shared path, _symbol_tf maps it into
+        # component coordinates.
+        self._symbol_path: QPainterPath | None = None
+        self._symbol_tf = QTransform()
+        self._symbol_pen = _shared_pen(QColor(20, 20, 20))
         self.symbol_text_items: List[QGraphicsTextItem] = []
 
         # ports
         self.ports: List[PortItem] = []
-        self._comp_def = load_component_library().get(self.kind)
+        # Every wire attached to any port, kept in sync by PortItem.add_wire /
+        # remove_wire so move refreshes walk one flat set.
+        self._all_wires: set[WireItem] = set()
+        # Same cached library the symbol caches are keyed on: a reload seen
+        # here drops stale per-kind symbols before _load_symbol_graphic runs.
+        self._comp_def = _symbol_library().get(self.kind)
         self._is_chip = bool(self._comp_def and getattr(self._comp_def, "is_chip", False))
+        self._is_net = bool(self._comp_def and getattr(self._comp_def, "comp_type", "component") == "net")
         self._chip_data: dict = {}
         self._auto_align_terminals = bool(getattr(self._comp_def, "auto_align_terminals", True))
         self._auto_scale_symbol = bool(getattr(self._comp_def, "auto_scale_symbol", True))
@@ -293,12 +568,20 @@ class ComponentItem(QGraphicsRectItem):
         return base
 
     def _load_chip_template(self, rel_path: str) -> dict:
-        try:
-            p = (user_assets_root() / "chips" / str(rel_path).replace("\\", "/")).resolve()
-            data = json.loads(p.read_text()) if p.exists() else {}
-            return data if isinstance(data, dict) else {}
-        except Exception:
-            return {}
+        _symbol_library()
+        key = str(rel_path)
+        data = _CHIP_TEMPLATE_CACHE.get(key)
+        if data is None:
+            try:
+                p = (user_assets_root() / "chips" / key.replace("\\", "/")).resolve()
+                data = json.loads(p.read_text()) if p.exists() else {}
+            except Exception:
+                data = {}
+            if not isinstance(data, dict):
+                data = {}
+            _CHIP_TEMPLATE_CACHE[key] = data
+        # Instances edit their chip data in place; never hand out the cached dict.
+        return copy.deepcopy(data)
 
     def _replace_ports(self, port_defs: list[tuple[str, QPointF, int | None]]):
         # Ports are child items; replacing them is safe before wiring.
@@ -310,6 +593,8 @@ class ComponentItem(QGraphicsRectItem):
             except Exception:
                 pass
         self.ports = [PortItem(self, name, pos, pin_number) for (name, pos, pin_number) in port_defs]
+        self._all_wires = {w for p in self.ports for w in p.wires}
+        self._routing_rect = None
         self.port_left = self.ports[0] if self.ports else None
         self.port_right = self.ports[1] if len(self.ports) > 1 else None
         self.prepareGeometryChange()
@@ -320,11 +605,12 @@ class ComponentItem(QGraphicsRectItem):
     def set_mirror(self, mirror_x: float, mirror_y: float):
         self._mirror_x = -1.0 if mirror_x < 0 else 1.0
         self._mirror_y = -1.0 if mirror_y < 0 else 1.0
-        self.setTransform(QTransform().scale(self._mirror_x, self._mirror_y))
-        for port in getattr(self, 'ports', []):
-            for w in list(port.wires):
-                w.update_path()
-        self._update_label()
+        tf = QTransform().scale(self._mirror_x, self._mirror_y)
+        if tf == self.transform():
+            return
+        # itemChange(ItemTransformHasChanged) refreshes wires and labels, so
+        # there is no second _refresh_attached() here.
+        self.setTransform(tf)
 
     def toggle_mirror_x(self):
         self.set_mirror(-self._mirror_x, self._mirror_y)
@@ -337,6 +623,7 @@ class ComponentItem(QGraphicsRectItem):
 
     def apply_theme(self, theme: Theme):
         self._theme = theme
+        self._label_color = QColor(theme.text)
         #self.setBrush(QBrush(theme.component_fill))
         #self.setPen(QPen(theme.component_stroke, 1.5))
         if hasattr(self, "refdes_label") and self.refdes_label is not None:
@@ -346,7 +633,9 @@ class ComponentItem(QGraphicsRectItem):
         for port in getattr(self, "ports", []):
             if hasattr(port, "apply_theme"):
                 port.apply_theme(theme)
-        self._apply_symbol_theme()
+        self._apply_symbol_theme(theme.component_stroke)
+        # Pooled pin labels keep their color until re-laid out.
+        self._update_pin_labels()
 
     def _add_debug_overlay(self):
         # Bright debug geometry to make the routing keep-out obvious.
@@ -375,85 +664,159 @@ class ComponentItem(QGraphicsRectItem):
 
     def _update_label(self):
         """Update label text/visibility and place defaults if not manually moved."""
-        from PySide6.QtWidgets import QApplication
-        sc = self.scene()
-        theme = getattr(sc, "theme", None) if sc else None
         ref_text = self.display_refdes().strip()
         val_text = self.value.strip()
-        is_net = bool(self._comp_def and getattr(self._comp_def, "comp_type", "component") == "net")
-        if theme:
-            self.refdes_label.setDefaultTextColor(theme.text)
-            self.value_label.setDefaultTextColor(theme.text)
-        else:
-            tc = QApplication.instance().palette().text().color()
-            self.refdes_label.setDefaultTextColor(tc)
-            self.value_label.setDefaultTextColor(tc)
-
-        self.refdes_label.setPlainText(ref_text)
-        self.value_label.setPlainText(val_text)
-
+        is_net = self._is_net
+        tc = self._label_text_color()
+        # Labels are only created once there is text for them; one whose text
+        # is cleared later is hidden rather than painted empty.
+        if ref_text and not is_net:  # nets never show a refdes
+            self._ensure_label("refdes")
+        if val_text:
+            self._ensure_label("value")
         br = self.routing_local_rect()
-        self.refdes_label.setVisible(not is_net)
-        if not self.refdes_label._manual_pos:
-            self.refdes_label.set_default_pos(QPointF(-self.refdes_label.boundingRect().width() / 2, br.top() - 18))
-        if not self.value_label._manual_pos:
-            if is_net:
-                self.value_label.set_default_pos(
-                    QPointF(br.right() + 6, -self.value_label.boundingRect().height() / 2)
-                )
-            else:
-                self.value_label.set_default_pos(
-                    QPointF(-self.value_label.boundingRect().width() / 2, br.bottom() + 4)
-                )
+        key = (
+            ref_text, val_text, is_net, tc.rgba(), br.getRect(),
+            self.rotation(), self._mirror_x, self._mirror_y,
+            getattr(self.refdes_label, "_manual_pos", None),
+            getattr(self.value_label, "_manual_pos", None),
+        )
+        if key == self._label_key:
+            # Nothing shown changed (the color is part of the key, and a label
+            # is only created when its text appears), e.g. a net while dragging.
+            return
+        self._label_key = key
+        labels = [lbl for lbl in (self.refdes_label, self.value_label) if lbl is not None]
+        for lbl in labels:
+            if lbl.defaultTextColor() != tc:
+                lbl.setDefaultTextColor(tc)
+        if self.refdes_label is not None:
+            self.refdes_label.set_text(ref_text)
+            self.refdes_label.setVisible(bool(ref_text) and not is_net)
+            if not self.refdes_label._manual_pos:
+                self.refdes_label.set_default_pos(QPointF(-self.refdes_label.text_size()[0] / 2, br.top() - 18))
+        if self.value_label is not None:
+            self.value_label.set_text(val_text)
+            self.value_label.setVisible(bool(val_text))
+            if not self.value_label._manual_pos:
+                if is_net:
+                    self.value_label.set_default_pos(
+                        QPointF(br.right() + 6, -self.value_label.text_size()[1] / 2)
+                    )
+                else:
+                    self.value_label.set_default_pos(
+                        QPointF(-self.value_label.text_size()[0] / 2, br.bottom() + 4)
+                    )
 
         # Keep text upright/readable for both rotation and mirroring.
-        label_tf = QTransform()
-        label_tf.rotate(-self.rotation())
-        label_tf.scale(self._mirror_x, self._mirror_y)
-        self.refdes_label.setRotation(0.0)
-        self.value_label.setRotation(0.0)
-        self.refdes_label.setTransform(label_tf)
-        self.value_label.setTransform(label_tf)
+        label_tf = self._upright_label_tf()
+        for lbl in labels:
+            if lbl.transform() != label_tf:  # only rotation/mirror changes it
+                lbl.setTransform(label_tf)
         self._update_pin_labels()
 
+    def _label_text_color(self) -> QColor:
+        """Text color for labels: the applied theme's, else the scene's, else the palette's.
+
+        apply_theme() keeps the theme color on the component, so the scene is
+        only consulted for components that have not been themed yet.
+        """
+        tc = self._label_color
+        if tc is None:
+            sc = self.scene()
+            theme = getattr(sc, "theme", None) if sc is not None else None
+            tc = theme.text if theme is not None else _palette_text_color()
+        return tc
+
+    def _upright_label_tf(self) -> QTransform:
+        """Label transform undoing the component's rotation/mirror.
+
+        Rebuilt only when rotation or mirror change, not on text updates.
+        """
+        tf_key = (self.rotation(), self._mirror_x, self._mirror_y)
+        if tf_key != self._label_tf_key:
+            self._label_tf_key = tf_key
+            tf = QTransform()
+            tf.rotate(-tf_key[0])
+            tf.scale(tf_key[1], tf_key[2])
+            self._label_tf = tf
+        return self._label_tf
+
+    def _ensure_label(self, kind: str) -> InlineLabel:
+        """Return the refdes/value label, creating it on first use."""
+        attr = "refdes_label" if kind == "refdes" else "value_label"
+        lbl = getattr(self, attr)
+        if lbl is None:
+            lbl = InlineLabel(self, kind)
+            setattr(self, attr, lbl)
+        return lbl
+
     def _update_pin_labels(self):
         # Only show per-pin numbering labels for chip boundary ports.
-        for lbl in getattr(self, "pin_labels", []):
+        ports = [p for p in getattr(self, "ports", []) if p is not None] if self.is_chip() else []
+        if not ports and not self.pin_labels:
+            return
+        text_color = self._label_text_color()
+        # Re-lay out only when pins, theme or text color changed. Label
+        # positions are in component coordinates, so a rotate/mirror only
+        # swaps transforms.
+        key = (
+            tuple((p.name, p.pos().x(), p.pos().y()) for p in ports),
+            self._theme,
+            text_color.rgba(),
+        )
+        if key == self._pin_label_key:
+            label_tf = self._upright_label_tf()
+            for t in self.pin_labels:
+                if t.transform() != label_tf:
+                    t.setTransform(label_tf)
+            return
+        self._pin_label_key = key
+
+        # Reuse the existing text items (one per port) and drop only the
+        # surplus. Outside a scene removeItem is unavailable, so unparent them.
+        labels = self.pin_labels
+        for lbl in labels[len(ports):]:
             try:
-                if lbl.scene() is not None:
-                    lbl.scene().removeItem(lbl)
+                lsc = lbl.scene()
+                if lsc is not None:
+                    lsc.removeItem(lbl)
+                else:
+                    lbl.setParentItem(None)
             except Exception:
                 pass
-        self.pin_labels = []
-        if not self.is_chip():
+        del labels[len(ports):]
+        if not ports:
             return
 
-        from PySide6.QtWidgets import QApplication
-        sc = self.scene()
-        text_color = (getattr(sc, "theme", None).text if getattr(sc, "theme", None) is not None
-                      else QApplication.instance().palette().text().color())
-        label_tf = QTransform()
-        label_tf.rotate(-self.rotation())
-        label_tf.scale(self._mirror_x, self._mirror_y)
-        for p in getattr(self, "ports", []):
-            if p is None:
-                continue
-            t = QGraphicsTextItem(str(getattr(p, "name", "")), self)
-            t.setDefaultTextColor(text_color)
-            t.setZValue(4)
-            t.setFlag(QGraphicsItem.ItemIsSelectable, False)
-            t.setFlag(QGraphicsItem.ItemIsMovable, False)
-            t.setRotation(0.0)
-            t.setTransform(label_tf)
+        label_tf = self._upright_label_tf()
+        for i, p in enumerate(ports):
+            name = str(getattr(p, "name", ""))
+            if i < len(labels):
+                t = labels[i]
+                if t.toPlainText() != name:
+                    t.setPlainText(name)
+            else:
+                t = QGraphicsTextItem(name, self)
+                t.setZValue(4)
+                t.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+                t.setFlag(QGraphicsItem.ItemIsSelectable, False)
+                t.setFlag(QGraphicsItem.ItemIsMovable, False)
+                labels.append(t)
+            if t.defaultTextColor() != text_color:
+                t.setDefaultTextColor(text_color)
+            if t.transform() != label_tf:
+                t.setTransform(label_tf)
             br = t.boundingRect()
             # Place pin number outward from pin side.
-            if p.pos().x() <= 0:
-                x = p.pos().x() - br.width() - 8
+            px, py = p.pos().x(), p.pos().y()
+            if px <= 0:
+                x = px - br.width() - 8
             else:
-                x = p.pos().x() + 8
-            y = p.pos().y() - br.height() / 2.0
-            t.setPos(QPointF(x, y))
-            self.pin_labels.append(t)
+                x = px + 8
+            pos = QPointF(x, py - br.height() / 2.0)
+            if t.pos() != pos:
+                t.setPos(pos)
 
     def set_refdes(self, refdes: str):
         text = (refdes or "").strip()
@@ -476,7 +839,7 @@ class ComponentItem(QGraphicsRectItem):
 
     def chip_data(self) -> dict:
         try:
-            return json.loads(json.dumps(self._chip_data or {}))
+            return copy.deepcopy(self._chip_data or {})
         except Exception:
             return {}
 
@@ -484,7 +847,7 @@ class ComponentItem(QGraphicsRectItem):
         prev_io = (self._chip_data or {}).get("io", {})
         if isinstance(data, dict):
             try:
-                self._chip_data = json.loads(json.dumps(data))
+                self._chip_data = copy.deepcopy(data)
             except Exception:
                 self._chip_data = {}
         else:
@@ -558,27 +921,58 @@ class ComponentItem(QGraphicsRectItem):
         return max(2, i + o)
 
     def labels_state(self) -> dict:
+        rp = self.refdes_label.pos() if self.refdes_label is not None else QPointF()
+        vp = self.value_label.pos() if self.value_label is not None else QPointF()
         return {
-            "refdes_pos": [float(self.refdes_label.pos().x()), float(self.refdes_label.pos().y())],
-            "value_pos": [float(self.value_label.pos().x()), float(self.value_label.pos().y())],
+            "refdes_pos": [float(rp.x()), float(rp.y())],
+            "value_pos": [float(vp.x()), float(vp.y())],
             "refdes_manual": bool(getattr(self.refdes_label, "_manual_pos", False)),
             "value_manual": bool(getattr(self.value_label, "_manual_pos", False)),
         }
 
     def apply_labels_state(self, state: dict):
         try:
-            rp = state.get("refdes_pos")
-            if isinstance(rp, (list, tuple)) and len(rp) == 2:
-                self.refdes_label.set_default_pos(QPointF(float(rp[0]), float(rp[1])))
-                self.refdes_label._manual_pos = bool(state.get("refdes_manual", True))
-            vp = state.get("value_pos")
-            if isinstance(vp, (list, tuple)) and len(vp) == 2:
-                self.value_label.set_default_pos(QPointF(float(vp[0]), float(vp[1])))
-                self.value_label._manual_pos = bool(state.get("value_manual", True))
+            for kind, pos in (("refdes", state.get("refdes_pos")), ("value", state.get("value_pos"))):
+                if not (isinstance(pos, (list, tuple)) and len(pos) == 2):
+                    continue
+                manual = bool(state.get(f"{kind}_manual", True))
+                if not manual and getattr(self, f"{kind}_label") is None:
+                    continue  # default placement is recomputed when the label is created
+                lbl = self._ensure_label(kind)
+                lbl.set_default_pos(QPointF(float(pos[0]), float(pos[1])))
+                lbl._manual_pos = manual
+            self._label_key = None
             self._update_label()
         except Exception:
             pass
 
+    def paint(self, painter, option, widget=None):
+        # The symbol outline is shared per kind and stroked here rather than by a
+        # child item per component. The body rect itself has no pen or brush, so
+        # only the selection outline needs the rect item's painter.
+        if self._symbol_path is not None:
+            painter.setPen(self._symbol_pen)
+            painter.setBrush(Qt.NoBrush)
+            if self._symbol_tf.isIdentity():
+                painter.drawPath(self._symbol_path)
+            else:
+                # Only the world transform changes; swapping it back is cheaper
+                # than save()/restore() of the whole painter state.
+                world = painter.worldTransform()
+                painter.setWorldTransform(self._symbol_tf * world)
+                painter.drawPath(self._symbol_path)
+                painter.setWorldTransform(world)
+        if option.state & QStyle.State_Selected:
+            super().paint(painter, option, widget)
+
+    def shape(self) -> QPainterPath:
+        # Hit area covers the body and symbol, as the symbol child item used to.
+        p = self._shape_path
+        if p is None:
+            p = self._shape_path = QPainterPath()
+            p.addRect(self.forbidden_local_rect())
+        return p
+
     def boundingRect(self) -> QRectF:
         # Include labels for proper repaint while moving; routing uses routing_local_rect() instead.
         r = self.routing_local_rect()
@@ -593,13 +987,14 @@ class ComponentItem(QGraphicsRectItem):
 
     def routing_local_rect(self) -> QRectF:
         """Tight component rect used by the router (ignores labels)."""
-        r = QRectF(-COMP_WIDTH / 2, -COMP_HEIGHT / 2, COMP_WIDTH, COMP_HEIGHT)
-        if self.symbol_item is not None:
-            r = r.united(self.symbol_item.mapRectToParent(self.symbol_item.boundingRect()))
-        for p in getattr(self, "ports", []):
-            if p is not None:
-                r = r.united(p.mapRectToParent(p.boundingRect()))
-        return r
+        r = self._routing_rect
+        if r is None:
+            r = self.forbidden_local_rect()
+            for p in getattr(self, "ports", []):
+                if p is not None:
+                    r = r.united(p.mapRectToParent(p.boundingRect()))
+            self._routing_rect = r
+        return QRectF(r)
 
     def forbidden_local_rect(self) -> QRectF:
         """Keep-out rect for routing around the component body/symbol.
@@ -608,10 +1003,21 @@ class ComponentItem(QGraphicsRectItem):
         wire may still approach a pin directly without the body itself becoming
         pass-through space.
         """
-        r = QRectF(-COMP_WIDTH / 2, -COMP_HEIGHT / 2, COMP_WIDTH, COMP_HEIGHT)
-        if self.symbol_item is not None:
-            r = r.united(self.symbol_item.mapRectToParent(self.symbol_item.boundingRect()))
-        return r
+        r = self._forbidden_rect
+        if r is None:
+            r = QRectF(-COMP_WIDTH / 2, -COMP_HEIGHT / 2, COMP_WIDTH, COMP_HEIGHT)
+            if self._symbol_path is not None:
+                r = r.united(self._symbol_rect())
+            self._forbidden_rect = r
+        return QRectF(r)
+
+    def _symbol_bounds(self) -> QRectF:
+        """Symbol outline bounds in symbol coordinates, including the stroke."""
+        hw = self._symbol_pen.widthF() / 2
+        return self._symbol_path.controlPointRect().adjusted(-hw, -hw, hw, hw)
+
+    def _symbol_rect(self) -> QRectF:
+        return self._symbol_tf.mapRect(self._symbol_bounds())
 
     def routing_scene_rect(self, pad: float = 0.0) -> QRectF:
         rr = self.mapRectToScene(self.routing_local_rect()).normalized()
@@ -627,14 +1033,7 @@ class ComponentItem(QGraphicsRectItem):
 
 
     def _symbol_path_for_kind(self) -> Optional[Path]:
-        comp_def = load_component_library().get(self.kind)
-        if comp_def and comp_def.symbol:
-            symbol = str(comp_def.symbol).replace("\\", "/")
-            base_sym = user_assets_root() / "symbols"
-            candidate = base_sym / symbol
-            if candidate.exists():
-                return candidate
-        return None
+        return _symbol_path_for(self.kind)
     
     def _load_symbol_graphic(self):
         """Load a JSON symbol and convert it to a QPainterPath."""
@@ -647,123 +1046,45 @@ class ComponentItem(QGraphicsRectItem):
             except Exception:
                 pass
         self.symbol_text_items = []
-        path = self._symbol_path_for_kind()
-        if path is None:
-            self.symbol_item = None
-            # Fallback: simple outline box so the component is visible.
-            p = QPainterPath()
-            p.addRect(-COMP_WIDTH / 2, -COMP_HEIGHT / 2, COMP_WIDTH, COMP_HEIGHT)
-            self.symbol_item = JsonSymbolItem(p)
-            self.symbol_item.setParentItem(self)
-            self._apply_symbol_theme()
-            return
-
-        try:
-            data = json.loads(path.read_text())
-            p = QPainterPath()
-            for shape in data.get("shapes", []):
-                t = shape.get("type")
-                if t == "line":
-                    p.moveTo(shape["x1"], shape["y1"])
-                    p.lineTo(shape["x2"], shape["y2"])
-                elif t == "rect":
-                    p.addRect(shape["x"], shape["y"], shape["w"], shape["h"])
-                elif t == "ellipse":
-                    p.addEllipse(shape["x"], shape["y"], shape["w"], shape["h"])
-                elif t == "polyline":
-                    pts = shape.get("points", [])
-                    if pts:
-                        p.moveTo(pts[0][0], pts[0][1])
-                        for x, y in pts[1:]:
-                            p.lineTo(x, y)
-                elif t == "text":
-                    txt = QGraphicsTextItem(str(shape.get("text", "")), self)
+        symbol = _symbol_for_kind(self.kind)
+        p = None
+        if symbol is not None:
+            try:
+                p, texts = symbol
+                for text, size, x, y in texts:
+                    txt = QGraphicsTextItem(text, self)
                     font = txt.font()
-                    font.setPointSize(int(shape.get("font_size", 12)))
+                    font.setPointSize(size)
                     txt.setFont(font)
-                    txt.setPos(float(shape.get("x", 0.0)), float(shape.get("y", 0.0)))
+                    txt.setPos(x, y)
                     txt.setZValue(2.5)
+                    txt.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
                     self.symbol_text_items.append(txt)
-            if p.isEmpty():
-                p = QPainterPath()
-                p.addRect(-COMP_WIDTH / 2, -COMP_HEIGHT / 2, COMP_WIDTH, COMP_HEIGHT)
-            self.symbol_item = JsonSymbolItem(p)
-            self.symbol_item.setParentItem(self)
-            self.symbol_item.setPos(0, 0)
-            self.symbol_item.setOpacity(1.0)
-            self.symbol_item.setVisible(True)
-            self._apply_symbol_theme()
-            return
-        except Exception:
-            self.symbol_item = None
+            except Exception:
+                p = None
+        if p is None or p.isEmpty():
             # Fallback: simple outline box so the component is visible.
-            p = QPainterPath()
-            p.addRect(-COMP_WIDTH / 2, -COMP_HEIGHT / 2, COMP_WIDTH, COMP_HEIGHT)
-            self.symbol_item = JsonSymbolItem(p)
-            self.symbol_item.setParentItem(self)
-            self.symbol_item.setPos(0, 0)
-            self.symbol_item.setOpacity(1.0)
-            self.symbol_item.setVisible(True)
-            self._apply_symbol_theme()
-            return
-
-    def _fit_symbol_to_body(self):
-        """Scale/align symbol to component body (optional)."""
-        if not self.symbol_item:
-            return
-        if not getattr(self, "_auto_scale_symbol", True):
-            # Keep user-drawn symbols at native size; just center them.
-            br = self.symbol_item.boundingRect()
-            if br.isNull():
-                return
-            center = br.center()
-            self.symbol_item.setScale(1.0)
-            self.symbol_item.setPos(-center.x(), -center.y())
-            return
-        br = self.symbol_item.boundingRect()
-        if br.isNull():
-            return
-
-        scale_x = (COMP_WIDTH - 12) / br.width()
-        scale_y = (COMP_HEIGHT - 12) / br.height()
-        scale = min(scale_x, scale_y)
-        self.symbol_item.setScale(scale)
-
-        center = br.center()
-        self.symbol_item.setPos(-center.x() * scale, -center.y() * scale)
+            p = _FALLBACK_SYMBOL_PATH
+        self._set_symbol_path(p)
 
-        def _snap_local(p: QPointF) -> QPointF:
-            # Keep terminal centers on the schematic grid after symbol scaling.
-            grid = 20.0
-            try:
-                sc = self.scene()
-                grid = float(getattr(sc, "grid_size", 20) or 20)
-            except Exception:
-                grid = 20.0
-            if grid <= 0:
-                grid = 20.0
-            return QPointF(round(p.x() / grid) * grid, round(p.y() / grid) * grid)
-
-        # Optionally align 1/2-terminal parts to symbol ends.
-        if self._auto_align_terminals and getattr(self, "ports", None) and len(self.ports) in (1, 2):
-            br_local = self.symbol_item.boundingRect()
-            br_mapped = self.symbol_item.mapRectToParent(br_local)
-            if len(self.ports) == 1:
-                top_center = _snap_local(QPointF(br_mapped.center().x(), br_mapped.top()))
-                self.ports[0].setPos(top_center)
-            else:
-                left_center = _snap_local(QPointF(br_mapped.left(), br_mapped.center().y()))
-                right_center = _snap_local(QPointF(br_mapped.right(), br_mapped.center().y()))
-                self.ports[0].setPos(left_center)
-                self.ports[1].setPos(right_center)
+    def _set_symbol_path(self, path: QPainterPath, tf: QTransform | None = None):
+        self.prepareGeometryChange()
+        self._symbol_path = path
+        self._symbol_tf = tf if tf is not None else QTransform()
+        self._routing_rect = None
+        self._forbidden_rect = None
+        self._shape_path = None
+        self._apply_symbol_theme()
+        self.update()
 
-    def _apply_symbol_theme(self):
-        if not self.symbol_item:
+    def _apply_symbol_theme(self, stroke: QColor | None = None):
+        """Stroke the symbol with ``stroke``, or the theme/background-derived color."""
+        if self._symbol_path is None:
             return
-        color = None
-        if self._theme is not None:
+        color = stroke
+        if color is None and self._theme is not None:
             color = self._theme.component_stroke
-        else:
+        elif color is None:
             try:
                 sc = self.scene()
                 bg = sc.backgroundBrush().color() if sc else None
@@ -771,38 +1092,39 @@ class ComponentItem(QGraphicsRectItem):
                 bg = None
             if bg is None or not isinstance(bg, QColor):
                 try:
-                    from PySide6.QtWidgets import QApplication
-                    app = QApplication.instance()
-                    bg = app.palette().color(app.palette().Window) if app else QColor(245, 246, 248)
+                    bg = _palette_color(QPalette.Window) if QApplication.instance() else QColor(245, 246, 248)
                 except Exception:
                     bg = QColor(245, 246, 248)
             color = _auto_contrast_color(bg)
 
-        if isinstance(self.symbol_item, JsonSymbolItem):
-            pen = self.symbol_item.pen()
-            pen.setColor(color)
-            pen.setWidthF(2)
-            self.symbol_item.setPen(pen)
+        pen = _shared_pen(color)
+        if self._symbol_pen != pen:
+            self._symbol_pen = pen
+            self.update()
         for text_item in getattr(self, "symbol_text_items", []):
-            text_item.setDefaultTextColor(color)
+            if text_item.defaultTextColor() != color:
+                text_item.setDefaultTextColor(color)
 
-    def _grid_size(self) -> float:
-        scene = self.scene()
+    def set_snap(self, on: bool, grid_size) -> None:
+        """Cache the scene's snap settings for the drag hot path."""
         try:
-            grid = float(getattr(scene, "grid_size", 20) or 20)
+            grid = float(grid_size or 20)
         except Exception:
             grid = 20.0
-        return grid if grid > 0 else 20.0
+        if grid <= 0:
+            grid = 20.0
+        self._snap_on = bool(on)
+        self._snap_grid = grid
 
     def _snap_point_to_grid(self, p: QPointF) -> QPointF:
-        grid = self._grid_size()
+        grid = self._snap_grid
         return QPointF(round(p.x() / grid) * grid, round(p.y() / grid) * grid)
 
     def _port_anchor_offset(self) -> QPointF:
-        ports = [p for p in getattr(self, "ports", []) if p is not None]
-        if not ports:
+        # First real port, without building a filtered list per drag event.
+        anchor = next((p for p in getattr(self, "ports", ()) if p is not None), None)
+        if anchor is None:
             return QPointF(0.0, 0.0)
-        anchor = ports[0]
         scene = self.scene()
         if scene is not None:
             try:
@@ -816,33 +1138,81 @@ class ComponentItem(QGraphicsRectItem):
         offset = self._port_anchor_offset()
         return self._snap_point_to_grid(scene_pos + offset) - offset
 
+    # itemChange runs for every drag event; compare against class attributes
+    # rather than resolving the enum through QGraphicsItem each time.
+    _POSITION_CHANGE = QGraphicsItem.ItemPositionChange
+    _POSITION_HAS_CHANGED = QGraphicsItem.ItemPositionHasChanged
+    _TRANSFORM_HAS_CHANGED = QGraphicsItem.ItemTransformHasChanged
+    _ROTATION_HAS_CHANGED = QGraphicsItem.ItemRotationHasChanged
+    _SCENE_HAS_CHANGED = QGraphicsItem.ItemSceneHasChanged
+
     def itemChange(self, change, value):
-        if change == QGraphicsItem.ItemPositionChange:
-            scene = self.scene()
-            if scene and getattr(scene, 'snap_on', False):
+        # Hot drag path first: snap the proposed position, then queue the
+        # refresh once it has moved. The base implementation only returns
+        # value, so the handled branches return it directly.
+        if change == self._POSITION_CHANGE:
+            if self._snap_on:
                 return self.snap_scene_pos_to_pin_grid(QPointF(value))
+            return value
+        if change == self._POSITION_HAS_CHANGED:
+            # A translation carries the child labels along; no relabel.
+            self._geometry_changed(False)
+            return value
+        if change == self._TRANSFORM_HAS_CHANGED:
+            # A transform (mirror) changes the label layout too.
+            self._geometry_changed(True)
+            return value
+        if change == self._ROTATION_HAS_CHANGED:
+            # Callers queue the wire/label refresh themselves (rotate_cw,
+            # RotateComponentCommand); only the pin positions go stale here.
+            self._clear_port_xy()
+            return value
+        if change == self._SCENE_HAS_CHANGED:
+            scene = self.scene()
+            if scene is not None:
+                self.set_snap(getattr(scene, "snap_on", False), getattr(scene, "grid_size", 20))
+            else:
+                self._snap_on = False
+        return super().itemChange(change, value)
+
+    def _clear_port_xy(self):
+        for p in self.ports:
+            p._scene_xy = None
 
-        if change in (QGraphicsItem.ItemPositionHasChanged, QGraphicsItem.ItemTransformHasChanged):
-            if getattr(self, 'ports', None):
-                for port in self.ports:
-                    for w in list(port.wires):
-                        w.update_path()
+    def _geometry_changed(self, relabel: bool):
+        self._clear_port_xy()
+        scene = self.scene()
+        if scene is not None:
+            # Let the scene coalesce wire/label refreshes across a group drag.
+            scene._schedule_component_moved(self, relabel)
+            return
+        for w in self._all_wires:
+            w.update_path()
+        if relabel:
             self._update_label()
-        return super().itemChange(change, value)
+
+    def _refresh_attached(self):
+        """Refresh attached wires and labels after a rotate/mirror.
+
+        In a scene this goes through the same coalesced flush as moves, so
+        rotating a selection (and the undo command re-applying it) updates
+        each wire once.
+        """
+        scene = self.scene()
+        if scene is not None:
+            scene._schedule_component_moved(self, relabel=True)
+            return
+        for w in self._all_wires:
+            w.update_path()
+        self._update_label()
 
     def rotate_cw(self):
         self.setRotation((self.rotation() + 90) % 360)
-        for port in getattr(self, 'ports', []):
-            for w in list(port.wires):
-                w.update_path()
-        self._update_label()
+        self._refresh_attached()
 
     def rotate_ccw(self):
         self.setRotation((self.rotation() - 90) % 360)
-        for port in getattr(self, 'ports', []):
-            for w in list(port.wires):
-                w.update_path()
-        self._update_label()
+        self._refresh_attached()
 
     def mousePressEvent(self, e):
         if e.button() == Qt.LeftButton:
@@ -889,20 +1259,38 @@ class WireItem(QGraphicsPathItem):
     ):
         super().__init__()
         self.setZValue(0)
-        pen = QPen(Qt.black, 2)
-        pen.setCosmetic(True)
-        self.setPen(pen)
+        # The item pen only fixes stroke width for boundingRect/shape; the color
+        # is painted from _draw_pen so theme/selection swaps are a plain update().
+        self.setPen(_shared_pen(QColor(Qt.black)))
+        self._draw_pen = self.pen()
 
         self.port_a = start_port
         self.port_b = end_port
         self._start_point = QPointF(start_point) if start_point is not None else None
         self._end_point = QPointF(end_point) if end_point is not None else None
         self._pts: List[QPointF] = list(points) if points else []
+        # Spine (interleaved floats) set by a segment-grip drag whose waypoints
+        # are not yet rebuilt; _take_pending_xy() folds it into _pts.
+        self._pending_xy: array | None = None
+        self._drag_xy = array("d")  # reused as _pending_xy by segment-grip drags
         self._custom_color: QColor | None = None
         self.route_mode = route_mode
         self._handles: list[_Handle] = []
         self._segment_handles: list[_SegmentHandle] = []
         self._updating_handles = False
+        self._defer_handle_sync = False  # a grip drag is in progress; see _sync_handles
+        # Last Manhattan spine and the endpoint/waypoint coordinates it was built from.
+        self._mpts_key: tuple | None = None
+        self._mpts_cache: list[QPointF] = []
+        self._mpts_spine_xy = array("d")  # same spine as interleaved x, y floats
+        self._mpts_xy = array("d")  # scratch buffer reused by _route_xy
+        # Same for the plain polyline drawn by free/45° wires.
+        self._free_key: tuple | None = None
+        self._free_cache: list[QPointF] = []
+        # Geometry the current QPainterPath was built from; update_path() is a no-op while it holds.
+        self._path_key: tuple | None = None
+        # Spine floats the current path was built from (orth wires only).
+        self._path_xy: array | None = None
 
         if self.port_a is not None:
             self.port_a.add_wire(self)
@@ -920,10 +1308,21 @@ class WireItem(QGraphicsPathItem):
     def apply_theme(self, theme: Theme, selected: bool | None = None):
         if selected is None:
             selected = self.isSelected()
-        pen = self.pen()
-        pen.setCosmetic(True)
-        pen.setColor(theme.wire_selected if selected else (self._custom_color or theme.wire))
-        self.setPen(pen)
+        self._set_pen_color(theme.wire_selected if selected else (self._custom_color or theme.wire))
+
+    def _set_pen_color(self, color: QColor):
+        # Same width as the item pen, so no prepareGeometryChange/index update.
+        pen = _shared_pen(QColor(color))
+        if self._draw_pen != pen:
+            self._draw_pen = pen
+            self.update()
+
+    def paint(self, painter, option, widget=None):
+        if option.state & QStyle.State_Selected:
+            super().paint(painter, option, widget)  # selection outline
+        painter.setPen(self._draw_pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self.path())
 
     def set_wire_color(self, color: QColor | str | None):
         if isinstance(color, str):
@@ -938,79 +1337,162 @@ class WireItem(QGraphicsPathItem):
         if theme:
             self.apply_theme(theme)
         else:
-            pen = self.pen()
-            pen.setColor(self._custom_color or Qt.black)
-            self.setPen(pen)
+            self._set_pen_color(self._custom_color or QColor(Qt.black))
 
     def wire_color_hex(self) -> str:
         return self._custom_color.name() if self._custom_color is not None else ""
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemSelectedHasChanged:
-            sc = self.scene(); theme = getattr(sc, "theme", None)
+            sc = self.scene(); theme = sc.theme if sc is not None else None
             if theme:
                 self.apply_theme(theme, selected=bool(value))
-            if self.route_mode == "orth":
-                self._rebuild_handles()
-                for h in self._handles:
-                    h.setVisible(bool(value))
-                for h in self._segment_handles:
-                    h.setVisible(bool(value))
+            # _sync_handles() (via _rebuild_handles) already sets handle visibility.
+            self._rebuild_handles()
         elif change == QGraphicsItem.ItemSceneHasChanged:
-            sc = self.scene(); theme = getattr(sc, "theme", None)
+            sc = self.scene(); theme = sc.theme if sc is not None else None
             if theme:
                 self.apply_theme(theme)
         return super().itemChange(change, value)
 
-    def _endpoint_pos(self, port: Optional[PortItem], fallback: QPointF | None) -> QPointF:
-        if port is not None:
-            return port.scenePos()
-        if fallback is not None:
-            return QPointF(fallback)
-        return QPointF()
-
-    def points(self) -> list[QPointF]:
-        out: list[QPointF] = []
-        out.append(self._endpoint_pos(self.port_a, self._start_point))
-        out.extend(self._pts)
-        out.append(self._endpoint_pos(self.port_b, self._end_point))
-        cleaned = [out[0]]
-        for p in out[1:]:
-            if (p - cleaned[-1]).manhattanLength() > 1e-6:
-                cleaned.append(p)
-        return cleaned
-
     def set_points(self, pts: list[QPointF]):
+        self._pending_xy = None
         self._pts = pts[:] if pts else []
+        self._invalidate_geom()
         self.update_path()
 
+    def waypoints(self) -> list[QPointF]:
+        """Current waypoints, including any segment drag not yet folded into _pts."""
+        self._take_pending_xy()
+        return list(self._pts)
+
+    def _invalidate_geom(self):
+        self._mpts_key = None
+        self._free_key = None
+        self._path_key = None
+
+    @staticmethod
+    def _endpoint_xy(port: Optional[PortItem], fallback: QPointF | None) -> tuple[float, float]:
+        if port is not None:
+            return port.scene_xy()
+        if fallback is not None:
+            return (fallback.x(), fallback.y())
+        return (0.0, 0.0)
+
+    def _geom_key(self) -> tuple:
+        self._take_pending_xy()
+        ax, ay = self._endpoint_xy(self.port_a, self._start_point)
+        bx, by = self._endpoint_xy(self.port_b, self._end_point)
+        return (ax, ay, bx, by, tuple((p.x(), p.y()) for p in self._pts))
+
     def _manhattan_points(self) -> list[QPointF]:
-        pts = self.points()
-        if not pts:
-            return []
-        out = [pts[0]]
-        for q in pts[1:]:
-            p = out[-1]
-            if abs(p.x() - q.x()) < 1e-6 or abs(p.y() - q.y()) < 1e-6:
-                out.append(q)
-            else:
-                out.append(QPointF(q.x(), p.y()))
-                out.append(q)
-        return out
+        key = self._geom_key()
+        # Callers may edit the list they get back; never hand out the cache itself.
+        return list(self._spine_for_key(key))
+
+    def _spine_for_key(self, key: tuple) -> list[QPointF]:
+        """Cached Manhattan spine for a _geom_key(); treat the result as read-only."""
+        if key != self._mpts_key:
+            xy = self._route_xy(key, True)
+            self._mpts_spine_xy = array("d", xy)
+            self._mpts_cache = self._points_from_xy(xy)
+            self._mpts_key = key
+        return self._mpts_cache
+
+    def _spine_xy_for_key(self, key: tuple) -> array:
+        """The cached spine as interleaved x, y floats; treat as read-only.
+
+        Drag handlers read coordinates from here as plain floats instead of
+        calling x()/y() on QPointFs.
+        """
+        self._spine_for_key(key)
+        return self._mpts_spine_xy
+
+    def _render_points_for_key(self, key: tuple) -> list[QPointF]:
+        """Cached render polyline for a _geom_key(); treat the result as read-only."""
+        if self.route_mode == "orth":
+            return self._spine_for_key(key)
+        if key != self._free_key:
+            self._free_cache = self._points_from_xy(self._route_xy(key, False))
+            self._free_key = key
+        return self._free_cache
+
+    @staticmethod
+    def _points_from_xy(xy: array) -> list[QPointF]:
+        # Pair the interleaved floats with one shared iterator rather than
+        # indexing the array twice per vertex.
+        it = iter(xy)
+        return [QPointF(x, y) for x, y in zip(it, it)]
+
+    def _route_xy(self, key: tuple, orth: bool) -> array:
+        """Build the polyline as interleaved x, y floats straight from the key.
+
+        Duplicate vertices are dropped and, for orth routing, a dogleg corner is
+        inserted between diagonal neighbours; QPointFs are only created once,
+        for the result.
+        """
+        ax, ay, bx, by, mids = key
+        xy = self._mpts_xy
+        del xy[:]
+        xy.extend((ax, ay))
+        if not mids:
+            # Plain terminal-to-terminal wire, the common case: one step and
+            # at most one corner, without building the vertex sequence.
+            if abs(bx - ax) + abs(by - ay) > 1e-6:
+                if orth and abs(ax - bx) >= 1e-6 and abs(ay - by) >= 1e-6:
+                    xy.extend((bx, ay))
+                xy.extend((bx, by))
+            return xy
+        px, py = ax, ay
+        for qx, qy in (*mids, (bx, by)):
+            if abs(qx - px) + abs(qy - py) <= 1e-6:
+                continue
+            if orth and abs(px - qx) >= 1e-6 and abs(py - qy) >= 1e-6:
+                xy.extend((qx, py))
+            xy.extend((qx, qy))
+            px, py = qx, qy
+        return xy
 
     def update_path(self):
+        key = self._geom_key()
+        if key == self._path_key:
+            return
+        self._path_key = key
         sc = self.scene()
-        pts = self.render_points()
+        pts = self._render_points_for_key(key)
         if not pts:
+            self._path_xy = None
             self.setPath(QPainterPath())
             return
-        p = QPainterPath(pts[0])
-        for q in pts[1:]:
-            p.lineTo(q)
+        xy = self._mpts_spine_xy if self.route_mode == "orth" else None
+        old = self._path_xy
+        if xy is not None and old is not None and len(old) == len(xy):
+            # Same vertex count (e.g. a grip drag): patch the moved vertices of
+            # the current path instead of rebuilding every element.
+            p = QPainterPath(self.path())
+            for k in range(0, len(xy), 2):
+                if xy[k] != old[k] or xy[k + 1] != old[k + 1]:
+                    p.setElementPositionAt(k >> 1, xy[k], xy[k + 1])
+        else:
+            # addPolygon emits the moveTo/lineTo run in one C++ call (open path).
+            p = QPainterPath()
+            p.addPolygon(QPolygonF(pts))
+        # _spine_for_key replaces (never mutates) the array, so keeping it is safe.
+        self._path_xy = xy
         self.setPath(p)
-        if sc and hasattr(sc, "_rebuild_junction_markers"):
-            sc._rebuild_junction_markers()
-        self._sync_handles()
+        if sc is not None:
+            sc.schedule_junction_rebuild()
+        # xy already is the Manhattan spine for orth wires.
+        self._sync_handles(xy)
+
+    def _schedule_update_path(self):
+        """update_path() on the scene's next flush, so mouse moves arriving
+        faster than repaints rebuild the path once per event-loop turn."""
+        sc = self.scene()
+        if sc is not None:
+            sc._mark_wire_dirty(self)
+        else:
+            self.update_path()
 
     def detach(self, scene):
         if hasattr(self.port_a, "remove_wire"):
@@ -1022,6 +1504,7 @@ class WireItem(QGraphicsPathItem):
         self._clear_handles(scene)
 
     def attach(self):
+        self._invalidate_geom()
         if hasattr(self.port_a, "add_wire"):
             self.port_a.add_wire(self)
         if hasattr(self.port_b, "add_wire"):
@@ -1030,156 +1513,306 @@ class WireItem(QGraphicsPathItem):
     def _rebuild_handles(self):
         if self.route_mode != "orth":
             return
+        if not self.isSelected():
+            # Deselecting only hides the pool; it is resized on the next selection.
+            self._sync_handles()
+            return
         sc = self.scene()
-        self._clear_handles(sc)
+        self._take_pending_xy()
         self._updating_handles = True
-        for i, pt in enumerate(self._pts):
+        # Keep existing grips (indices are positional); only grow or trim the tail.
+        n = len(self._pts)
+        self._remove_handles(self._handles[n:], sc)
+        del self._handles[n:]
+        for i in range(len(self._handles), n):
             h = _Handle(self, i)
             h.setParentItem(self)
-            h.setPos(pt)
-            h.setVisible(self.isSelected())
             self._handles.append(h)
-        spine = self._manhattan_points()
-        for i in range(1, len(spine) - 2):
-            h = _SegmentHandle(self, i)
+        xy = self._spine_xy_for_key(self._geom_key())
+        n = max(0, len(xy) // 2 - 3)
+        self._remove_handles(self._segment_handles[n:], sc)
+        del self._segment_handles[n:]
+        for i in range(len(self._segment_handles), n):
+            h = _SegmentHandle(self, i + 1)
             h.setParentItem(self)
-            h.setVisible(self.isSelected())
             self._segment_handles.append(h)
         self._updating_handles = False
-        self._sync_handles()
+        self._sync_handles(xy)
 
-    def _sync_handles(self):
-        if self._updating_handles:
+    def _sync_handles(self, xy: array | None = None):
+        if self._updating_handles or self._defer_handle_sync:
+            # While a grip is dragged only the grips it moves are placed
+            # (by the grip itself); the rest are realigned on release.
             return
         if self.route_mode != "orth":
             return
+        self._take_pending_xy()
         self._updating_handles = True
+        if not self.isSelected():
+            # Hidden grips keep stale positions (so a drag of an unselected
+            # wire costs no setPos calls); selecting the wire re-syncs them.
+            for h in self._handles:
+                h.setVisible(False)
+            for h in self._segment_handles:
+                h.setVisible(False)
+            self._updating_handles = False
+            return
         for i, h in enumerate(self._handles):
             if i < len(self._pts):
-                h.setPos(self._pts[i])
-            h.setVisible(self.isSelected())
-        spine = self._manhattan_points()
+                self._place_handle(h, self._pts[i])
+            h.setVisible(True)
+        if xy is None:
+            xy = self._spine_xy_for_key(self._geom_key())
+        n = len(xy) // 2
         for h in self._segment_handles:
             i = h.seg_idx
-            if i <= 0 or i + 1 >= len(spine) - 1:
+            if i <= 0 or i + 1 >= n - 1:
                 h.setVisible(False)
                 continue
-            a = spine[i]
-            b = spine[i + 1]
-            if (b - a).manhattanLength() < 1e-6:
+            # Segment ends read straight from the float spine (no QPointFs).
+            j = 2 * i
+            ax, ay, bx, by = xy[j], xy[j + 1], xy[j + 2], xy[j + 3]
+            if abs(bx - ax) + abs(by - ay) < 1e-6:
                 h.setVisible(False)
                 continue
-            h.setPos(QPointF((a.x() + b.x()) * 0.5, (a.y() + b.y()) * 0.5))
-            h.setVisible(self.isSelected())
+            self._place_handle(h, QPointF((ax + bx) * 0.5, (ay + by) * 0.5))
+            h.setVisible(True)
         self._updating_handles = False
 
-    def _clear_handles(self, sc):
-        for h in self._handles:
-            try:
-                if sc:
-                    sc.removeItem(h)
-            except Exception:
-                pass
-        for h in self._segment_handles:
+    @staticmethod
+    def _place_handle(h, pos: QPointF):
+        # Programmatic moves need no itemChange round trip into Python; with
+        # geometry notifications off, Qt skips the dispatch altogether.
+        h.setFlag(QGraphicsItem.ItemSendsGeometryChanges, False)
+        h.setPos(pos)
+        h.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
+
+    @staticmethod
+    def _remove_handles(handles, sc):
+        for h in handles:
             try:
                 if sc:
                     sc.removeItem(h)
             except Exception:
                 pass
+
+    def _clear_handles(self, sc):
+        self._remove_handles(self._handles, sc)
+        self._remove_handles(self._segment_handles, sc)
         self._handles = []
         self._segment_handles = []
 
-    def _set_pts_from_spine(self, spine: list[QPointF]):
-        if len(spine) <= 2:
-            self._pts = []
-        else:
-            self._pts = [QPointF(p) for p in spine[1:-1]]
+    def _set_pts_from_xy(self, xy: array):
+        """Set the waypoints to the interior of a spine given as interleaved floats."""
+        self._pending_xy = None
+        self._pts = self._points_from_xy(xy[2:-2]) if len(xy) > 4 else []
 
-    def render_points(self) -> list[QPointF]:
-        if self.route_mode == "orth":
-            return self._manhattan_points()
-        return self.points()
+    def _drag_spine(self, xy: array) -> array:
+        """xy as the wire's editable drag buffer: the pending spine is edited in
+        place, any other spine is copied into the buffer (reallocated only when
+        the vertex count changes)."""
+        buf = self._drag_xy
+        if xy is not buf:
+            buf[:] = xy
+        return buf
+
+    def _take_pending_xy(self):
+        if self._pending_xy is not None:
+            self._set_pts_from_xy(self._pending_xy)
 
+    def render_points(self) -> list[QPointF]:
+        # Copy for the same reason as _manhattan_points().
+        return list(self._render_points_for_key(self._geom_key()))
+
+
+def _drag_snap_grid(scene) -> float:
+    """Grid for a grip drag in scene, or 0.0 with snapping off."""
+    if not getattr(scene, "snap_on", False):
+        return 0.0
+    try:
+        g = float(getattr(scene, "grid_size", 0) or 0)
+    except Exception:
+        g = 0.0
+    return g if g > 0 else 0.0
+
+
+def _end_grip_drag(grip):
+    """Finish a grip drag (release or lost grab): stop snapping and realign
+    the wire's grips that were left alone during the drag."""
+    grip._snap_grid = 0.0
+    w = grip.wire
+    if w._defer_handle_sync:
+        w._defer_handle_sync = False
+        w._sync_handles()
+
+
+class _Handle(QGraphicsItem):
+    """Waypoint grip: a fixed-size circle painted with shared pen/brush."""
+    _RECT = QRectF(-4.0, -4.0, 8.0, 8.0)
+    _BR = QRectF(-4.5, -4.5, 9.0, 9.0)  # includes half the pen width
+    _PEN = _PEN_HANDLE
+    _BRUSH = _BRUSH_WHITE
+    _snap_grid = 0.0  # scene grid during a snapping drag; 0.0: off
 
-class _Handle(QGraphicsEllipseItem):
     def __init__(self, wire: WireItem, idx: int):
-        super().__init__(-4.0, -4.0, 8.0, 8.0)
+        super().__init__()
         self.wire = wire
         self.idx = idx
-        self.setBrush(QBrush(Qt.white))
-        self.setPen(QPen(Qt.darkGray, 1))
         self.setZValue(3)
         self.setFlag(QGraphicsItem.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
 
+    def mousePressEvent(self, e):
+        # Read the scene's snap settings once per drag, not per move event.
+        self._snap_grid = _drag_snap_grid(self.scene())
+        self.wire._defer_handle_sync = True
+        super().mousePressEvent(e)
+
+    def mouseReleaseEvent(self, e):
+        super().mouseReleaseEvent(e)
+        _end_grip_drag(self)
+
+    def ungrabMouseEvent(self, e):
+        # Grab lost without a release (focus change, popup, item removed).
+        super().ungrabMouseEvent(e)
+        _end_grip_drag(self)
+
     def itemChange(self, change, value):
-        if change == QGraphicsItem.ItemPositionChange:
-            if getattr(self.wire, "_updating_handles", False):
-                return value
-            scene = self.scene()
-            mouse = value
-            if hasattr(scene, "_snap_point"):
-                mouse = scene._snap_point(mouse)
-
-            w = self.wire
-            i = self.idx
-            prev_pt = w._endpoint_pos(w.port_a, w._start_point) if i == 0 else w._pts[i - 1]
-            next_pt = w._endpoint_pos(w.port_b, w._end_point) if i == len(w._pts) - 1 else w._pts[i + 1]
-
-            cand1 = QPointF(prev_pt.x(), mouse.y())
-            cand2 = QPointF(mouse.x(), next_pt.y())
-            d1 = (cand1.x() - mouse.x()) ** 2 + (cand1.y() - mouse.y()) ** 2
-            d2 = (cand2.x() - mouse.x()) ** 2 + (cand2.y() - mouse.y()) ** 2
-            newpos = cand1 if d1 <= d2 else cand2
-
-            w._pts[i] = newpos
-            w.update_path()
-            return newpos
-        return super().itemChange(change, value)
+        # Grips only react to drags. The base implementation just returns
+        # value, so other notifications skip the call back into Qt.
+        if change != QGraphicsItem.ItemPositionChange:
+            return value
+        # wire is always a WireItem: plain attribute reads, no getattr default.
+        w = self.wire
+        if w._updating_handles:
+            return value
+        # Same rounding as scene._snap_point, inlined with the drag's grid.
+        mx, my = value.x(), value.y()
+        g = self._snap_grid
+        if g:
+            mx = round(mx / g) * g
+            my = round(my / g) * g
+
+        w._take_pending_xy()
+        i = self.idx
+        # Only prev.x and next.y are needed; read them as floats (port ends
+        # come from the cached scene position, no QPointF per event).
+        px = w._endpoint_xy(w.port_a, w._start_point)[0] if i == 0 else w._pts[i - 1].x()
+        ny = w._endpoint_xy(w.port_b, w._end_point)[1] if i == len(w._pts) - 1 else w._pts[i + 1].y()
+
+        # Candidates (prev.x, mouse.y) and (mouse.x, next.y) each differ from
+        # the mouse on one axis only, so compare those deltas directly.
+        dx = mx - px
+        dy = my - ny
+        newpos = QPointF(px, my) if dx * dx <= dy * dy else QPointF(mx, ny)
+        if newpos == w._pts[i]:
+            return newpos  # same snapped corner as last event
+
+        w._pts[i] = newpos
+        w._schedule_update_path()
+        return newpos
+
+    def boundingRect(self) -> QRectF:
+        return self._BR
+
+    def paint(self, painter, option, widget=None):
+        painter.setPen(self._PEN)
+        painter.setBrush(self._BRUSH)
+        painter.drawEllipse(self._RECT)
 
 
 class _SegmentHandle(QGraphicsRectItem):
+    _snap_grid = 0.0  # scene grid during a snapping drag; 0.0: off
+
     def __init__(self, wire: WireItem, seg_idx: int):
         super().__init__(-5.0, -5.0, 10.0, 10.0)
         self.wire = wire
         self.seg_idx = seg_idx
-        self.setBrush(QBrush(Qt.lightGray))
-        self.setPen(QPen(Qt.darkGray, 1))
+        self.setBrush(_BRUSH_LIGHT_GRAY)
+        self.setPen(_PEN_HANDLE)
         self.setZValue(3)
         self.setFlag(QGraphicsItem.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
 
+    def mousePressEvent(self, e):
+        # Read the scene's snap settings once per drag, not per move event.
+        self._snap_grid = _drag_snap_grid(self.scene())
+        self.wire._defer_handle_sync = True
+        super().mousePressEvent(e)
+
+    def mouseReleaseEvent(self, e):
+        super().mouseReleaseEvent(e)
+        _end_grip_drag(self)
+
+    def ungrabMouseEvent(self, e):
+        # Grab lost without a release (focus change, popup, item removed).
+        super().ungrabMouseEvent(e)
+        _end_grip_drag(self)
+
     def itemChange(self, change, value):
-        if change == QGraphicsItem.ItemPositionChange:
-            if getattr(self.wire, "_updating_handles", False):
-                return value
-            scene = self.scene()
-            mouse = value
-            if hasattr(scene, "_snap_point"):
-                mouse = scene._snap_point(mouse)
-
-            w = self.wire
-            spine = w._manhattan_points()
-            i = self.seg_idx
-            if i <= 0 or i + 1 >= len(spine) - 1:
+        # Grips only react to drags. The base implementation just returns
+        # value, so other notifications skip the call back into Qt.
+        if change != QGraphicsItem.ItemPositionChange:
+            return value
+        # wire is always a WireItem: plain attribute reads, no getattr default.
+        w = self.wire
+        if w._updating_handles:
+            return value
+        # Several moves can arrive before the scene flushes the path; they
+        # edit the pending spine, and the waypoints are rebuilt from it once
+        # per flush. Otherwise read the wire's cached spine in place (it is
+        # rebuilt on demand, so no defensive copy per mouse event).
+        xy = w._pending_xy
+        if xy is None:
+            xy = w._spine_xy_for_key(w._geom_key())
+        i = self.seg_idx
+        # Grips are not re-synced while a drag is in progress, and the spine
+        # can lose vertices mid-drag, so re-check seg_idx against the current
+        # spine on every move. End segments are pinned to the terminals.
+        if i <= 0 or 2 * i + 4 >= len(xy):
+            return self.pos()
+
+        g = self._snap_grid
+        j = 2 * i
+        ax, ay, bx, by = xy[j], xy[j + 1], xy[j + 2], xy[j + 3]
+        if abs(bx - ax) + abs(by - ay) < 1e-6:
+            return self.pos()  # collapsed segment: nothing to move
+        # Orientation comes from the current spine on every move: rebuilding
+        # it drops coincident vertices, so seg_idx can land on a different
+        # segment mid-drag. Moves that snap back into the segment's current
+        # grid line change nothing, so they skip the copy and the path
+        # rebuild. Only the coordinate across the segment moves, so only that
+        # one is snapped (same rounding as scene._snap_point).
+        if abs(ax - bx) < 1e-6:
+            nx = value.x()
+            if g:
+                nx = round(nx / g) * g
+            if nx == ax:
                 return self.pos()
-
-            a = QPointF(spine[i])
-            b = QPointF(spine[i + 1])
-            if abs(a.x() - b.x()) < 1e-6:
-                nx = mouse.x()
-                spine[i].setX(nx)
-                spine[i + 1].setX(nx)
-                newpos = QPointF(nx, (a.y() + b.y()) * 0.5)
-            elif abs(a.y() - b.y()) < 1e-6:
-                ny = mouse.y()
-                spine[i].setY(ny)
-                spine[i + 1].setY(ny)
-                newpos = QPointF((a.x() + b.x()) * 0.5, ny)
-            else:
+            xy = w._drag_spine(xy)
+            xy[j] = xy[j + 2] = nx
+            newpos = QPointF(nx, (ay + by) * 0.5)
+        elif abs(ay - by) < 1e-6:
+            ny = value.y()
+            if g:
+                ny = round(ny / g) * g
+            if ny == ay:
                 return self.pos()
-
-            w._set_pts_from_spine(spine)
-            w.update_path()
-            return newpos
-        return super().itemChange(change, value)
+            xy = w._drag_spine(xy)
+            xy[j + 1] = xy[j + 3] = ny
+            newpos = QPointF((ax + bx) * 0.5, ny)
+        else:
+            return self.pos()
+
+        w._pending_xy = xy
+        # Keep the corner grips at both ends of the dragged segment (spine
+        # points i and i + 1, i.e. waypoints i - 1 and i) on the wire; the
+        # other grips are realigned once, on release.
+        hs = w._handles
+        n = min(len(hs), len(xy) // 2 - 2)
+        if i - 1 < n:
+            w._place_handle(hs[i - 1], QPointF(xy[j], xy[j + 1]))
+        if i < n:
+            w._place_handle(hs[i], QPointF(xy[j + 2], xy[j + 3]))
+        w._schedule_update_path()
+        return newpos
@@ -1614,7 +1614,7 @@ class MainWindow(QMainWindow):
             if not include:
                 continue
             entry = {
-                "points": [{"x": float(p.x()), "y": float(p.y())} for p in getattr(w, "_pts", [])],
+                "points": [{"x": float(p.x()), "y": float(p.y())} for p in (w.waypoints() if hasattr(w, "waypoints") else [])],
                 "mode": getattr(w, "route_mode", "orth"),
             }
             if hasattr(w, "wire_color_hex"):
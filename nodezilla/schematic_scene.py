@@ -5,10 +5,14 @@ from __future__ import annotations
 from typing import Optional, List, Dict, Tuple
 import heapq
 import json
+import time
 import zlib
 from PySide6.QtCore import Qt, QPointF, QRectF, Signal, QTimer
-from PySide6.QtGui import QPen, QPainterPath, QTransform, QPainter, QBrush, QColor
-from PySide6.QtWidgets import QGraphicsScene, QLabel, QGraphicsView, QGraphicsItem, QGraphicsEllipseItem
+from PySide6.QtGui import QPen, QPainterPath, QTransform, QPainter, QBrush, QColor, QGuiApplication
+from PySide6.QtWidgets import (
+    QGraphicsScene, QLabel, QGraphicsView, QGraphicsItem, QGraphicsEllipseItem, QGraphicsPathItem,
+    QGraphicsTextItem,
+)
 from .graphics_items import ComponentItem, PortItem, CommentTextItem
 from .commands import SetWirePointsCommand
 from typing import TYPE_CHECKING
@@ -32,6 +36,55 @@ class SchematicScene(QGraphicsScene):
     class Mode:
         SELECT = 0; PLACE = 1; WIRE = 2
 
+    # Snap settings are pushed to components (ComponentItem.set_snap) so the
+    # drag snap doesn't query the scene on every mouse event.
+    _snap_on = True
+    _grid_size = 20
+    _grid_on = True
+
+    @property
+    def snap_on(self) -> bool:
+        return self._snap_on
+
+    @snap_on.setter
+    def snap_on(self, on: bool):
+        self._snap_on = on
+        self._push_snap_settings()
+
+    @property
+    def grid_size(self) -> int:
+        return self._grid_size
+
+    @grid_size.setter
+    def grid_size(self, size: int):
+        if size != self._grid_size:
+            self._grid_size = size
+            self._refresh_background()
+        self._push_snap_settings()
+
+    # Views cache the grid (QGraphicsView.CacheBackground) so wire and
+    # component drags only blit it; anything drawBackground depends on must
+    # drop that cache when it changes.
+    @property
+    def grid_on(self) -> bool:
+        return self._grid_on
+
+    @grid_on.setter
+    def grid_on(self, on: bool):
+        if on != self._grid_on:
+            self._grid_on = on
+            self._refresh_background()
+
+    def _refresh_background(self):
+        for view in self.views():
+            view.resetCachedContent()
+        self.update()
+
+    def _push_snap_settings(self):
+        for it in self.items():
+            if isinstance(it, ComponentItem):
+                it.set_snap(self._snap_on, self._grid_size)
+
     def __init__(self, status_label: QLabel, undo_stack):
         super().__init__()
         self.mode = SchematicScene.Mode.SELECT
@@ -57,12 +110,21 @@ class SchematicScene(QGraphicsScene):
         self._route_start_point: Optional[QPointF] = None
         self._temp_dash = None        # QGraphicsPathItem (you already use one)
         # Explicit wire junctions (only when user connects wires)
-        self._junction_markers: list[QGraphicsItem] = []
+        self._junction_markers: Dict[Tuple[float, float], QGraphicsItem] = {}
         self._wire_junctions: set[Tuple[float, float]] = set()
         self._junction_owners: Dict[Tuple[float, float], set] = {}
         self._net_name_overrides: Dict[Tuple[float, float], str] = {}
         self._net_label_overrides: Dict[Tuple[float, float], str] = {}
         self._net_update_pending = False
+        self._junction_rebuild_pending = False
+        # Deferred item refreshes, flushed once per event-loop turn and at most
+        # once per display frame (see _schedule_flush / _flush_dirty).
+        self._moved_components: set[ComponentItem] = set()
+        self._relabel_components: set[ComponentItem] = set()
+        self._dirty_wires: set = set()
+        self._flush_pending = False
+        self._last_flush = 0.0
+        self._frame_interval: float | None = None
         self.changed.connect(self._schedule_nets_changed)
         self.wire_route_mode = "orth"  # orth | free | 45
         self._place_refdes_override: str = ""
@@ -100,7 +162,7 @@ class SchematicScene(QGraphicsScene):
             pen = self._temp_dash.pen()
             pen.setColor(theme.wire_selected)
             self._temp_dash.setPen(pen)
-        self.update()
+        self._refresh_background()  # grid color follows the theme
         self._rebuild_junction_markers()
 
     @staticmethod
@@ -189,6 +251,60 @@ class SchematicScene(QGraphicsScene):
         self._view = view
 
     # callbacks from items
+    def _schedule_component_moved(self, comp: ComponentItem, relabel: bool = False):
+        """Queue a wire/label refresh for a moved component.
+
+        A group drag moves every selected component per mouse event; the
+        flush then updates each attached wire once instead of once per port.
+        Labels are children and follow a plain translation by themselves, so
+        they are only re-laid out when ``relabel`` is set (rotate/mirror).
+        """
+        self._moved_components.add(comp)
+        if relabel:
+            self._relabel_components.add(comp)
+        self._schedule_flush()
+
+    def _mark_wire_dirty(self, wire):
+        """Queue a path rebuild for ``wire`` on the next flush."""
+        self._dirty_wires.add(wire)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_pending:
+            return
+        self._flush_pending = True
+        # A high-rate mouse can deliver several moves per repaint: when the
+        # last flush was less than a frame ago, wait out the rest of it.
+        wait = self._last_flush + self._display_frame_interval() - time.perf_counter()
+        QTimer.singleShot(max(0, int(wait * 1000.0)), self._flush_dirty)
+
+    def _display_frame_interval(self) -> float:
+        if self._frame_interval is None:
+            try:
+                hz = QGuiApplication.primaryScreen().refreshRate()
+            except Exception:
+                hz = 0.0
+            self._frame_interval = 1.0 / hz if hz and hz > 0 else 1.0 / 60.0
+        return self._frame_interval
+
+    def _flush_dirty(self):
+        self._flush_pending = False
+        self._last_flush = time.perf_counter()
+        comps = list(self._moved_components)
+        self._moved_components.clear()
+        wires = self._dirty_wires
+        self._dirty_wires = set()
+        for c in comps:
+            wires |= c._all_wires
+        for w in wires:
+            w.update_path()
+        relabel = self._relabel_components
+        self._relabel_components = set()
+        for c in relabel:
+            c._update_label()
+        # The path updates only queued a marker rebuild; do it once, now.
+        self._flush_junction_rebuild()
+
     def on_component_moved(self, comp: ComponentItem, old_pos: QPointF, new_pos: QPointF):
         self._reroute_wires_blocked_by_component(comp)
         self.undo_stack.push(MoveComponentCommand(comp, old_pos, new_pos))
@@ -292,9 +408,7 @@ class SchematicScene(QGraphicsScene):
             return lo - tol <= p.x() <= hi + tol
         return False
 
-    def _wire_contains_point(self, wire, p: QPointF, tol: float | None = None) -> bool:
-        """Return True if point hits a wire segment (with tolerance)."""
-        pts = wire.render_points() if hasattr(wire, "render_points") else wire._manhattan_points()
+    def _polyline_contains_point(self, pts: list[QPointF], p: QPointF, tol: float | None = None) -> bool:
         if not pts:
             return False
         if tol is None:
@@ -327,52 +441,89 @@ class SchematicScene(QGraphicsScene):
         dy = py - qy
         return (dx * dx + dy * dy) <= tol * tol
 
-    def _closest_point_on_segment(self, p: QPointF, a: QPointF, b: QPointF) -> QPointF:
-        ax, ay = a.x(), a.y()
-        bx, by = b.x(), b.y()
-        px, py = p.x(), p.y()
-        abx = bx - ax
-        aby = by - ay
-        ab2 = abx * abx + aby * aby
-        if ab2 < 1e-12:
-            return QPointF(ax, ay)
-        t = ((px - ax) * abx + (py - ay) * aby) / ab2
-        if t < 0.0:
-            t = 0.0
-        elif t > 1.0:
-            t = 1.0
-        return QPointF(ax + t * abx, ay + t * aby)
-
     def _snap_to_wire(self, scene_pos: QPointF) -> QPointF | None:
         if _WireItem is None:
             return None
-        wires = [it for it in self.items() if isinstance(it, _WireItem)]
-        if not wires:
-            return None
         gs = float(getattr(self, "grid_size", 20) or 20)
         tol = max(6.0, gs * 0.6)
+        px, py = scene_pos.x(), scene_pos.y()
+        # Any segment within tol of the cursor has its wire's bounding rect
+        # inside this box, so the scene's BSP index yields the candidates
+        # without sweeping every wire on each mouse move.
+        box = QRectF(px - tol, py - tol, 2 * tol, 2 * tol)
+        wires = [
+            it for it in self.items(box, Qt.IntersectsItemBoundingRect)
+            if isinstance(it, _WireItem)
+        ]
+        if not wires:
+            return None
         best = None
         best_d2 = tol * tol
         for w in wires:
             pts = w.render_points() if hasattr(w, "render_points") else w._manhattan_points()
-            for i in range(len(pts) - 1):
-                q = self._closest_point_on_segment(scene_pos, pts[i], pts[i + 1])
-                d2 = (q.x() - scene_pos.x()) ** 2 + (q.y() - scene_pos.y()) ** 2
-                if d2 <= best_d2:
-                    best_d2 = d2
-                    best = q
+            hit = self._closest_on_polyline(px, py, pts)
+            if hit is not None and hit[3] <= best_d2:
+                best_d2 = hit[3]
+                best = hit
+        return QPointF(best[0], best[1]) if best is not None else None
+
+    @staticmethod
+    def _closest_on_polyline(px: float, py: float, pts: list[QPointF]) -> tuple[float, float, int, float] | None:
+        """Closest point to (px, py) on a polyline as (x, y, segment_index, dist²).
+
+        Projects onto each segment on plain floats, so callers scanning many
+        segments only build a QPointF for the winner.
+        """
+        if len(pts) < 2:
+            return None
+        best = None
+        ax, ay = pts[0].x(), pts[0].y()
+        for i in range(1, len(pts)):
+            q = pts[i]
+            bx, by = q.x(), q.y()
+            abx = bx - ax
+            aby = by - ay
+            ab2 = abx * abx + aby * aby
+            if ab2 < 1e-12:
+                t = 0.0
+            else:
+                t = ((px - ax) * abx + (py - ay) * aby) / ab2
+                if t < 0.0:
+                    t = 0.0
+                elif t > 1.0:
+                    t = 1.0
+            qx = ax + t * abx
+            qy = ay + t * aby
+            d2 = (qx - px) ** 2 + (qy - py) ** 2
+            if best is None or d2 < best[3]:
+                best = (qx, qy, i - 1, d2)
+            ax, ay = bx, by
         return best
 
-    def _wires_at_key(self, key: Tuple[float, float]):
+    def _wire_polylines(self) -> list[tuple[object, list[QPointF]]]:
+        """Snapshot (wire, render points) for every wire in the scene."""
+        if _WireItem is None:
+            return []
+        return [
+            (it, it.render_points() if hasattr(it, "render_points") else it._manhattan_points())
+            for it in self.items() if isinstance(it, _WireItem)
+        ]
+
+    def _wires_at_key(self, key: Tuple[float, float], polylines=None):
+        """Wires passing through key; pass a _wire_polylines() snapshot when
+        querying many keys so the scene is swept once, not once per key."""
         if _WireItem is None:
             return []
+        if polylines is None:
+            polylines = self._wire_polylines()
         p = QPointF(float(key[0]), float(key[1]))
-        wires = [it for it in self.items() if isinstance(it, _WireItem)]
-        return [w for w in wires if self._wire_contains_point(w, p)]
+        return [w for w, pts in polylines if self._polyline_contains_point(pts, p)]
 
     def _implicit_wire_join_keys(
         self,
         wire_endpoint_keys: Dict[object, tuple[Tuple[float, float], Tuple[float, float]] | None],
+        polylines=None,
+        owners_by_key: Dict[Tuple[float, float], list] | None = None,
     ) -> set[Tuple[float, float]]:
         """Return endpoint keys that should behave like intentional T-junctions.
 
@@ -382,12 +533,19 @@ class SchematicScene(QGraphicsScene):
         """
         if _WireItem is None:
             return set()
+        if polylines is None:
+            polylines = self._wire_polylines()
+        if owners_by_key is None:
+            owners_by_key = {}
         out: set[Tuple[float, float]] = set()
         for wire, endpoints in wire_endpoint_keys.items():
             if not endpoints:
                 continue
             for key in endpoints:
-                owners = [w for w in self._wires_at_key(key) if w is not None]
+                # Wires meeting at a point share the endpoint key; look it up once.
+                owners = owners_by_key.get(key)
+                if owners is None:
+                    owners = owners_by_key[key] = self._wires_at_key(key, polylines)
                 if len(owners) >= 2:
                     out.add(key)
         return out
@@ -402,53 +560,98 @@ class SchematicScene(QGraphicsScene):
         owners = self._junction_owners.setdefault(key, set())
         owners.add(wire)
 
+    def schedule_junction_rebuild(self):
+        """Coalesce junction marker rebuilds into one pass per event-loop turn."""
+        if self._junction_rebuild_pending:
+            return
+        self._junction_rebuild_pending = True
+        QTimer.singleShot(0, self._flush_junction_rebuild)
+
+    def _flush_junction_rebuild(self):
+        if self._junction_rebuild_pending:
+            self._rebuild_junction_markers()
+
     def _rebuild_junction_markers(self):
         """Show explicit wire junction nodes where wires are intentionally connected."""
+        # A direct rebuild satisfies any deferred one already queued.
+        self._junction_rebuild_pending = False
 
-        # Clear existing markers first
-        for dot in list(self._junction_markers):
-            try:
-                self.removeItem(dot)
-            except Exception:
-                pass
-        self._junction_markers.clear()
+        # Markers are keyed by position: ones that are still live are kept as
+        # they are, so a drag that leaves the junction set alone adds/removes
+        # no scene items.
+        old_markers = self._junction_markers
+        self._junction_markers = {}
 
         if _WireItem is None:
+            self._remove_junction_markers(old_markers.values())
             return
 
-        wires = [it for it in self.items() if isinstance(it, _WireItem)]
+        # One sweep of the scene per rebuild; every key lookup below reuses it.
+        polylines = self._wire_polylines()
         wire_endpoint_keys: Dict[object, tuple[Tuple[float, float], Tuple[float, float]] | None] = {}
-        for w in wires:
-            pts = w.render_points() if hasattr(w, "render_points") else w._manhattan_points()
+        for w, pts in polylines:
             if pts and len(pts) >= 2:
                 wire_endpoint_keys[w] = (self._net_point_key(pts[0]), self._net_point_key(pts[-1]))
             else:
                 wire_endpoint_keys[w] = None
 
         live_junctions: set[Tuple[float, float]] = set()
+        owners_by_key: Dict[Tuple[float, float], list] = {}
         marker_keys = set(self._wire_junctions)
-        marker_keys.update(self._implicit_wire_join_keys(wire_endpoint_keys))
+        marker_keys.update(self._implicit_wire_join_keys(wire_endpoint_keys, polylines, owners_by_key))
+        pen_color = self.theme.wire if self.theme else Qt.black
+        pen = QPen(pen_color, 2)
+        pen.setCosmetic(True)
+        brush = QBrush(pen_color)
+        new_keys: list[Tuple[float, float]] = []
         for (x, y) in sorted(marker_keys):
-            owners = self._wires_at_key((x, y))
+            owners = owners_by_key.get((x, y))
+            if owners is None:
+                owners = self._wires_at_key((x, y), polylines)
             if len(owners) < 2:
                 continue
             live_junctions.add((x, y))
-            r = 4.0
-            dot = QGraphicsEllipseItem(x - r, y - r, 2 * r, 2 * r)
-            pen_color = self.theme.wire if self.theme else Qt.black
-            pen = QPen(pen_color, 2)
-            pen.setCosmetic(True)
-            dot.setPen(pen)
-            dot.setBrush(QBrush(pen_color))
-            dot.setZValue(2)
-            dot.setAcceptedMouseButtons(Qt.NoButton)
-            self.addItem(dot)
-            self._junction_markers.append(dot)
+            dot = old_markers.pop((x, y), None)
+            if dot is not None and dot.scene() is self:
+                self._junction_markers[(x, y)] = dot
+            else:
+                new_keys.append((x, y))
+        # A junction that moved (e.g. a dragged T) reuses a stale dot: setPos
+        # only dirties the old and new dot rects instead of a remove + add.
+        spare = [d for d in old_markers.values() if d.scene() is self]
+        r = 4.0
+        for (x, y) in new_keys:
+            if spare:
+                dot = spare.pop()
+                dot.setPos(x, y)
+            else:
+                dot = QGraphicsEllipseItem(-r, -r, 2 * r, 2 * r)
+                dot.setPos(x, y)
+                dot.setPen(pen)
+                dot.setBrush(brush)
+                dot.setZValue(2)
+                dot.setAcceptedMouseButtons(Qt.NoButton)
+                self.addItem(dot)
+            self._junction_markers[(x, y)] = dot
+        for dot in self._junction_markers.values():
+            if dot.pen() != pen:
+                dot.setPen(pen)
+                dot.setBrush(brush)
+        self._remove_junction_markers(spare)
         self._wire_junctions.update(live_junctions)
 
+    def _remove_junction_markers(self, dots):
+        for dot in list(dots):
+            try:
+                if dot.scene() is self:
+                    self.removeItem(dot)
+            except Exception:
+                pass
+
     def _snap_point(self, p: QPointF) -> QPointF:
-        if not self.snap_on: return p
-        g = self.grid_size; return QPointF(round(p.x()/g)*g, round(p.y()/g)*g)
+        if not self._snap_on: return p
+        g = self._grid_size
+        return QPointF(round(p.x() / g) * g, round(p.y() / g) * g)
 
     def _wire_mode_label(self) -> str:
         return {"orth": "Orthogonal", "free": "Free", "45": "45°"} .get(self.wire_route_mode, "Orthogonal")
@@ -708,11 +911,29 @@ class SchematicScene(QGraphicsScene):
         return []
 
 
-    def _segment_clear(self, a: QPointF, b: QPointF, rects: list[QRectF]) -> bool:
+    @staticmethod
+    def _obstacle_bounds(rects: list[QRectF]) -> list[tuple[float, float, float, float]]:
+        """Padded (left, top, right, bottom) floats for _segment_clear, built once per query."""
+        out: list[tuple[float, float, float, float]] = []
+        for r in rects:
+            rr = r.normalized().adjusted(-0.5, -0.5, 0.5, 0.5)
+            out.append((rr.left(), rr.top(), rr.right(), rr.bottom()))
+        return out
+
+    def _segment_clear(
+        self,
+        a: QPointF,
+        b: QPointF,
+        rects: list[QRectF],
+        bounds: list[tuple[float, float, float, float]] | None = None,
+    ) -> bool:
         """Return True if an orthogonal segment a->b does not cross any obstacle rect.
 
         This uses a stroked QPainterPath intersection test, which is much more robust than
         thin-rectangle intersects checks for exact-on-grid segments.
+
+        Callers testing many segments against the same rects can pass
+        ``bounds`` from _obstacle_bounds() to skip re-normalizing every rect.
         """
         if a == b:
             return True
@@ -723,21 +944,21 @@ class SchematicScene(QGraphicsScene):
         by = b.y()
         tol = 1e-6
         if abs(ax - bx) < tol or abs(ay - by) < tol:
+            if bounds is None:
+                bounds = self._obstacle_bounds(rects)
             if abs(ax - bx) < tol:
                 x = ax
                 y1, y2 = (ay, by) if ay <= by else (by, ay)
-                for r in rects:
-                    rr = r.normalized().adjusted(-0.5, -0.5, 0.5, 0.5)
-                    if rr.left() - tol <= x <= rr.right() + tol:
-                        if not (y2 < rr.top() - tol or y1 > rr.bottom() + tol):
+                for left, top, right, bottom in bounds:
+                    if left - tol <= x <= right + tol:
+                        if not (y2 < top - tol or y1 > bottom + tol):
                             return False
             else:
                 y = ay
                 x1, x2 = (ax, bx) if ax <= bx else (bx, ax)
-                for r in rects:
-                    rr = r.normalized().adjusted(-0.5, -0.5, 0.5, 0.5)
-                    if rr.top() - tol <= y <= rr.bottom() + tol:
-                        if not (x2 < rr.left() - tol or x1 > rr.right() + tol):
+                for left, top, right, bottom in bounds:
+                    if top - tol <= y <= bottom + tol:
+                        if not (x2 < left - tol or x1 > right + tol):
                             return False
             return True
 
@@ -823,8 +1044,9 @@ class SchematicScene(QGraphicsScene):
     ) -> bool:
         segs = self._segments_from_points(self._simplify_points(pts))
         prior = existing or []
+        bounds = self._obstacle_bounds(rects)
         for i, (a, b) in enumerate(segs):
-            if not self._segment_clear(a, b, rects):
+            if not self._segment_clear(a, b, rects, bounds):
                 return False
             if self._segment_crosses_existing(a, b, prior + segs[:i], allow_touch_at=allow_touch_at):
                 return False
@@ -941,6 +1163,7 @@ class SchematicScene(QGraphicsScene):
                 self._grid_point((maxx, maxy)),
             ).normalized()
             local_rects = [r for r in rects if r.intersects(scene_box.adjusted(-self.grid_size, -self.grid_size, self.grid_size, self.grid_size))]
+            local_bounds = self._obstacle_bounds(local_rects)
 
             open_heap: list[tuple[float, float, Tuple[int, int], Optional[str]]] = []
             start_state = (start, None)
@@ -966,7 +1189,7 @@ class SchematicScene(QGraphicsScene):
                         continue
                     pa = self._grid_point(node)
                     pb = self._grid_point(nxt)
-                    if not self._segment_clear(pa, pb, local_rects):
+                    if not self._segment_clear(pa, pb, local_rects, local_bounds):
                         continue
                     if self._segment_crosses_existing(pa, pb, existing, allow_touch_at=allow_touch_at):
                         continue
@@ -1146,20 +1369,8 @@ class SchematicScene(QGraphicsScene):
             return snapped, 0, [snapped]
 
         # Find the closest point on any rendered segment (already orthogonal)
-        best_d2 = float("inf"); insert_idx = 0; best_q = spine[0]; best_a = spine[0]; best_b = spine[1]
-        for i in range(len(spine) - 1):
-            a, b = spine[i], spine[i + 1]
-            abx, aby = (b.x() - a.x()), (b.y() - a.y())
-            ab2 = abx * abx + aby * aby
-            if ab2 == 0:
-                q = a
-            else:
-                t = ((raw_pos.x() - a.x()) * abx + (raw_pos.y() - a.y()) * aby) / ab2
-                t = 0.0 if t < 0 else 1.0 if t > 1 else t
-                q = QPointF(a.x() + t * abx, a.y() + t * aby)
-            d2 = (q.x() - raw_pos.x()) ** 2 + (q.y() - raw_pos.y()) ** 2
-            if d2 < best_d2:
-                best_d2, best_q, insert_idx, best_a, best_b = d2, q, i, a, b
+        qx, qy, insert_idx, _d2 = self._closest_on_polyline(raw_pos.x(), raw_pos.y(), spine)
+        best_q = QPointF(qx, qy); best_a = spine[insert_idx]; best_b = spine[insert_idx + 1]
 
         # Keep snapped anchor on the original segment axis to avoid off-wire anchors.
         if abs(best_a.x() - best_b.x()) < 1e-6:
@@ -1331,7 +1542,6 @@ class SchematicScene(QGraphicsScene):
         )
 
     def _start_temp_wire(self):
-        from PySide6.QtWidgets import QGraphicsPathItem
         self._temp_dash = QGraphicsPathItem()
         pen = QPen(Qt.black, 1.2)
         pen.setCosmetic(True)
@@ -1508,8 +1718,7 @@ class SchematicScene(QGraphicsScene):
 
     def keyPressEvent(self, e):
         fi = self.focusItem()
-        from PySide6.QtWidgets import QGraphicsTextItem as _QGT
-        if isinstance(fi, _QGT) and fi.textInteractionFlags() != Qt.NoTextInteraction:
+        if isinstance(fi, QGraphicsTextItem) and fi.textInteractionFlags() != Qt.NoTextInteraction:
             return super().keyPressEvent(e)
         if e.key() in (Qt.Key_Delete, Qt.Key_Backspace):
             sel = self.selectedItems()
@@ -1696,12 +1905,14 @@ class SchematicScene(QGraphicsScene):
         wire_points: Dict[object, List[Tuple[float, float]]] = {}
         wire_endpoint_keys: Dict[object, tuple[Tuple[float, float], Tuple[float, float]] | None] = {}
         endpoint_to_wires: Dict[Tuple[float, float], List[object]] = {}
+        polylines: list[tuple[object, list[QPointF]]] = []
         for w in wires:
             key = ("wire", id(w))
             wire_nodes[w] = key
             node_to_wire[key] = w
             uf.add(key)
             pts = w.render_points() if hasattr(w, "render_points") else w._manhattan_points()
+            polylines.append((w, pts))
             wire_points[w] = [self._net_point_key(p) for p in pts] if pts else []
             if pts and len(pts) >= 2:
                 start_key = self._net_point_key(pts[0])
@@ -1738,11 +1949,14 @@ class SchematicScene(QGraphicsScene):
         # Wire-to-wire joins only happen at explicit junction nodes.
         active_junctions: set[Tuple[float, float]] = set()
         join_keys = set(self._wire_junctions)
-        join_keys.update(self._implicit_wire_join_keys(wire_endpoint_keys))
+        owners_by_key: Dict[Tuple[float, float], list] = {}
+        join_keys.update(self._implicit_wire_join_keys(wire_endpoint_keys, polylines, owners_by_key))
         for key in list(join_keys):
             owners = list(self._junction_owners.get(key, set()))
             if not owners:
-                owners = self._wires_at_key(key)
+                owners = owners_by_key.get(key)
+                if owners is None:
+                    owners = self._wires_at_key(key, polylines)
             if len(owners) < 2:
                 continue
             active_junctions.add(key)
@@ -1876,7 +2090,7 @@ class SchematicScene(QGraphicsScene):
             a = port_ref.get(w.port_a)
             b = port_ref.get(w.port_b)
             #Include waypoints (if any) and free endpoints
-            pts = getattr(w, "_pts", [])
+            pts = w.waypoints()
             entry = {
                 'points': [{'x': float(p.x()), 'y': float(p.y())} for p in pts]
             }
@@ -1939,12 +2153,8 @@ class SchematicScene(QGraphicsScene):
         self.grid_on = s.get('grid_on', self.grid_on); self.grid_size = s.get('grid_size', self.grid_size)
         self.grid_style = s.get('grid_style', self.grid_style); self.snap_on = s.get('snap_on', self.snap_on)
         self._junction_owners = {}
-        for dot in list(getattr(self, "_junction_markers", [])):
-            try:
-                self.removeItem(dot)
-            except Exception:
-                pass
-        self._junction_markers = []
+        self._remove_junction_markers(getattr(self, "_junction_markers", {}).values())
+        self._junction_markers = {}
         self._wire_junctions = set()
         for entry in s.get('wire_junctions', []):
             try:
@@ -12,6 +12,10 @@ class SchematicView(QGraphicsView):
         self.setRenderHint(QPainter.Antialiasing)
         self.setDragMode(QGraphicsView.RubberBandDrag)
         self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        # The dotted grid is drawn point by point in Python; cache it so item
+        # updates only repaint their own dirty rects over a blitted background.
+        # SchematicScene resets the cache when grid settings or theme change.
+        self.setCacheMode(QGraphicsView.CacheBackground)
         self.setMouseTracking(True)
         if self.viewport():
             self.viewport().setMouseTracking(True)
@@ -69,6 +69,14 @@ DARK = Theme(
     wire_selected=QColor(0, 180, 255), # brighter highlight
 )
 
+# Event types that can change the detected theme. ThemeWatcher filters every
+# event of the application, so the check is a single set lookup.
+_THEME_EVENT_TYPES = frozenset((
+    QEvent.Type.ApplicationPaletteChange,
+    QEvent.Type.PaletteChange,
+    QEvent.Type.StyleChange,
+))
+
 class ThemeWatcher(QObject):
     """Listens for OS theme changes and calls a callback with the active Theme."""
     def __init__(self, app: QApplication, on_theme_changed):
@@ -101,10 +109,6 @@ class ThemeWatcher(QObject):
 
     def eventFilter(self, obj, event):
         """React to palette/style changes and re-apply theme."""
-        if event.type() in (
-            QEvent.Type.ApplicationPaletteChange,
-            QEvent.Type.PaletteChange,
-            QEvent.Type.StyleChange,
-        ):
+        if event.type() in _THEME_EVENT_TYPES:
             self._emit_if_changed(force=False)
         return super().eventFilter(obj, event)